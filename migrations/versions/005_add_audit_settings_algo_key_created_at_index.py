@@ -0,0 +1,30 @@
+"""Add composite (algo_key, created_at) index on audit_settings
+
+Revision ID: 005_audit_settings_algo_key_created_at
+Revises: 004_add_algorithm_runs_table
+Create Date: 2025-08-25 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_audit_settings_algo_key_created_at'
+down_revision = '004_add_algorithm_runs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves both the latest-audit-per-algorithm lookup and per-algorithm history;
+    # actor is carried in the leaf so history scans stay index-only on PostgreSQL
+    op.create_index(
+        'ix_audit_settings_algo_key_created_at',
+        'audit_settings',
+        ['algo_key', 'created_at'],
+        postgresql_include=['actor']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_settings_algo_key_created_at', table_name='audit_settings')
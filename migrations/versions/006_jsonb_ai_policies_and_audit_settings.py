@@ -0,0 +1,56 @@
+"""Store ai_policies guards and audit_settings diffs as JSONB with GIN indexes
+
+Revision ID: 006_jsonb_ai_policies_audit_settings
+Revises: 005_audit_settings_algo_key_created_at
+Create Date: 2025-08-26 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_jsonb_ai_policies_audit_settings'
+down_revision = '005_audit_settings_algo_key_created_at'
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = [
+    ('ai_policies', 'hard_guards_json'),
+    ('ai_policies', 'soft_guards_json'),
+    ('audit_settings', 'diff_json'),
+]
+
+GIN_INDEXES = [
+    ('ix_ai_policies_hard_guards_gin', 'ai_policies', 'hard_guards_json'),
+    ('ix_audit_settings_diff_json_gin', 'audit_settings', 'diff_json'),
+]
+
+
+def upgrade() -> None:
+    # JSONB and GIN only exist on PostgreSQL; other backends keep plain JSON
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in JSONB_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb'
+        )
+    for name, table, column in GIN_INDEXES:
+        op.create_index(name, table, [column], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in GIN_INDEXES:
+        op.drop_index(name, table_name=table)
+    for table, column in JSONB_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json'
+        )
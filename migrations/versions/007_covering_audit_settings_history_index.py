@@ -0,0 +1,24 @@
+"""Drop the audit_settings algo_key index
+
+Revision ID: 007_audit_settings_covering_index
+Revises: 006_jsonb_ai_policies_audit_settings
+Create Date: 2025-08-26 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_audit_settings_covering_index'
+down_revision = '006_jsonb_ai_policies_audit_settings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (algo_key, created_at) already serves every algo_key-only lookup
+    op.drop_index('ix_audit_settings_algo_key', table_name='audit_settings')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_settings_algo_key', 'audit_settings', ['algo_key'])
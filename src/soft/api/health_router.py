@@ -1,11 +1,11 @@
 """
 Health Router - Provides health check endpoints for the SmartLinks API.
 """
-from datetime import datetime, timezone
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from typing import Dict, Any
 import logging
+from ..clock import iso_now
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ async def health_check() -> Dict[str, str]:
     response = {
         "status": "ok",
         "service": "SmartLinks API",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": iso_now()
     }
     logger.debug(f"Health check: {response}")
     return response
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, List
-from pydantic import BaseModel
+from typing_extensions import TypedDict
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 import logging
 
@@ -10,25 +12,47 @@ from ..models import Offer, Creator, Segment
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/settings", tags=["settings"])
 
-class SettingsResponse(BaseModel):
+# Valeurs par défaut des champs exposés mais absents des tables creators/segments
+_CREATOR_DEFAULTS: Dict[str, Any] = {
+    "name": "Unnamed Creator",
+    "email": "",
+    "status": "active",
+    "commission_rate": 0.1,
+    "total_earnings": 0.0,
+}
+
+_SEGMENT_DEFAULTS: Dict[str, Any] = {
+    "name": "Unnamed Segment",
+    "description": "",
+    "status": "active",
+    "traffic_source": "unknown",
+}
+
+# Paramètres modifiables via l'API
+_ALLOWED_GENERAL_KEYS = frozenset({
+    "app_name", "timezone", "currency", "default_cap_day",
+    "fraud_threshold", "auto_approval", "email_notifications",
+    "slack_notifications", "max_daily_budget", "min_payout_threshold"
+})
+_NON_NEGATIVE_GENERAL_KEYS = frozenset({"default_cap_day", "max_daily_budget", "min_payout_threshold"})
+_ALLOWED_OFFER_KEYS = frozenset({"name", "url", "status", "cap_day", "geo_allow", "incent_ok"})
+
+class SettingsResponse(TypedDict):
     general: Dict[str, Any]
     offers: List[Dict[str, Any]]
     creators: List[Dict[str, Any]]
     segments: List[Dict[str, Any]]
 
-class UpdateSettingRequest(BaseModel):
+class UpdateSettingRequest(TypedDict):
     key: str
     value: Any
 
-@router.get("", response_model=SettingsResponse)
-async def get_settings(db: Session = Depends(get_db)):
+def _build_settings_payload(db: Session) -> SettingsResponse:
     """
-    Récupère tous les paramètres de l'application
+    Construit la structure complète des paramètres (partagée par GET /settings et /export)
     TOUJOURS retourne une structure complète même si BDD vide
     """
     try:
-        logger.info("get_settings called")
-        
         # Paramètres généraux - TOUJOURS présents
         general_settings = {
             "app_name": "SmartLinks Autopilot",
@@ -49,63 +73,58 @@ async def get_settings(db: Session = Depends(get_db)):
         # Récupérer les offres avec gestion d'erreur
         offers_data = []
         try:
-            offers = db.query(Offer).all()
-            logger.info(f"Found {len(offers)} offers in database")
+            offers = db.query(Offer).with_entities(
+                Offer.offer_id, Offer.name, Offer.url, Offer.status,
+                Offer.cap_day, Offer.geo_allow, Offer.incent_ok
+            ).all()
+            logger.info("Found %s offers in database", len(offers))
             
             for offer in offers:
                 offers_data.append({
-                    "offer_id": getattr(offer, 'offer_id', 'unknown'),
-                    "name": getattr(offer, 'name', 'Unnamed Offer'),
-                    "url": getattr(offer, 'url', ''),
-                    "status": getattr(offer, 'status', 'active'),
-                    "cap_day": getattr(offer, 'cap_day', 1000),
-                    "geo_allow": getattr(offer, 'geo_allow', 'ALL'),
-                    "incent_ok": bool(getattr(offer, 'incent_ok', True))
+                    "offer_id": offer.offer_id or 'unknown',
+                    "name": offer.name or 'Unnamed Offer',
+                    "url": offer.url or '',
+                    "status": offer.status or 'active',
+                    "cap_day": offer.cap_day if offer.cap_day is not None else 1000,
+                    "geo_allow": offer.geo_allow or 'ALL',
+                    "incent_ok": bool(offer.incent_ok if offer.incent_ok is not None else True)
                 })
         except Exception as e:
-            logger.warning(f"Error loading offers: {e}")
+            logger.warning("Error loading offers: %s", e)
             # Return empty list but valid structure
         
         # Récupérer les créateurs avec gestion d'erreur
+        # Seul creator_id est mappé : les autres champs prennent leur valeur par défaut
         creators_data = []
         try:
-            creators = db.query(Creator).all()
-            logger.info(f"Found {len(creators)} creators in database")
+            creator_ids = db.query(Creator).with_entities(Creator.creator_id).all()
+            logger.info("Found %s creators in database", len(creator_ids))
             
-            for creator in creators:
+            for (creator_id,) in creator_ids:
                 creators_data.append({
-                    "creator_id": getattr(creator, 'creator_id', 'unknown'),
-                    "name": getattr(creator, 'name', 'Unnamed Creator'),
-                    "email": getattr(creator, 'email', ''),
-                    "status": getattr(creator, 'status', 'active'),
-                    "commission_rate": float(getattr(creator, 'commission_rate', 0.1)),
-                    "total_earnings": float(getattr(creator, 'total_earnings', 0) or 0)
+                    "creator_id": creator_id or 'unknown',
+                    **_CREATOR_DEFAULTS
                 })
         except Exception as e:
-            logger.warning(f"Error loading creators: {e}")
+            logger.warning("Error loading creators: %s", e)
             # Return empty list but valid structure
         
         # Récupérer les segments avec gestion d'erreur
+        # Seul segment_id est mappé : les autres champs prennent leur valeur par défaut
         segments_data = []
         try:
-            segments = db.query(Segment).all()
-            logger.info(f"Found {len(segments)} segments in database")
+            segment_ids = db.query(Segment).with_entities(Segment.segment_id).all()
+            logger.info("Found %s segments in database", len(segment_ids))
             
-            for segment in segments:
-                geo_targets = getattr(segment, 'geo_targets', '')
-                device_targets = getattr(segment, 'device_targets', '')
-                
+            for (segment_id,) in segment_ids:
                 segments_data.append({
-                    "segment_id": getattr(segment, 'segment_id', 'unknown'),
-                    "name": getattr(segment, 'name', 'Unnamed Segment'),
-                    "description": getattr(segment, 'description', ''),
-                    "status": getattr(segment, 'status', 'active'),
-                    "traffic_source": getattr(segment, 'traffic_source', 'unknown'),
-                    "geo_targets": geo_targets.split(',') if geo_targets else [],
-                    "device_targets": device_targets.split(',') if device_targets else []
+                    "segment_id": segment_id or 'unknown',
+                    **_SEGMENT_DEFAULTS,
+                    "geo_targets": [],
+                    "device_targets": []
                 })
         except Exception as e:
-            logger.warning(f"Error loading segments: {e}")
+            logger.warning("Error loading segments: %s", e)
             # Return empty list but valid structure
         
         return SettingsResponse(
@@ -116,12 +135,20 @@ async def get_settings(db: Session = Depends(get_db)):
         )
         
     except Exception as e:
-        logger.error(f"Erreur récupération settings: {e}", exc_info=True)
+        logger.error("Erreur récupération settings: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la récupération des paramètres: {str(e)}"
         )
 
+@router.get("")
+async def get_settings(db: Session = Depends(get_db)):
+    """
+    Récupère tous les paramètres de l'application
+    """
+    logger.info("get_settings called")
+    return _build_settings_payload(db)
+
 @router.put("/general")
 async def update_general_setting(
     request: UpdateSettingRequest,
@@ -134,26 +161,20 @@ async def update_general_setting(
         # Pour cette démo, on simule la mise à jour
         # Dans une vraie app, on sauvegarderait en base
         
-        allowed_keys = [
-            "app_name", "timezone", "currency", "default_cap_day",
-            "fraud_threshold", "auto_approval", "email_notifications",
-            "slack_notifications", "max_daily_budget", "min_payout_threshold"
-        ]
-        
-        if request.key not in allowed_keys:
+        if request['key'] not in _ALLOWED_GENERAL_KEYS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Paramètre '{request.key}' non autorisé"
+                detail=f"Paramètre '{request['key']}' non autorisé"
             )
         
         # Validation basique selon le type
-        if request.key in ["fraud_threshold"] and not (0 <= request.value <= 1):
+        if request['key'] == "fraud_threshold" and not (0 <= request['value'] <= 1):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="fraud_threshold doit être entre 0 et 1"
             )
         
-        if request.key in ["default_cap_day", "max_daily_budget", "min_payout_threshold"] and request.value < 0:
+        if request['key'] in _NON_NEGATIVE_GENERAL_KEYS and request['value'] < 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Les valeurs numériques doivent être positives"
@@ -161,15 +182,15 @@ async def update_general_setting(
         
         return {
             "success": True,
-            "message": f"Paramètre '{request.key}' mis à jour avec succès",
-            "key": request.key,
-            "value": request.value
+            "message": f"Paramètre '{request['key']}' mis à jour avec succès",
+            "key": request['key'],
+            "value": request['value']
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erreur mise à jour setting: {e}", exc_info=True)
+        logger.error("Erreur mise à jour setting: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de la mise à jour: {str(e)}"
@@ -185,37 +206,38 @@ async def update_offer_setting(
     Met à jour un paramètre d'offre
     """
     try:
-        offer = db.query(Offer).filter(Offer.offer_id == offer_id).first()
-        if not offer:
+        if request['key'] not in _ALLOWED_OFFER_KEYS:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Offre '{offer_id}' non trouvée"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Paramètre '{request['key']}' non autorisé pour les offres"
             )
         
-        allowed_keys = ["name", "url", "status", "cap_day", "geo_allow", "incent_ok"]
-        
-        if request.key not in allowed_keys:
+        # Mettre à jour l'offre en une seule requête (UPDATE ... RETURNING)
+        updated = db.execute(
+            update(Offer)
+            .where(Offer.offer_id == offer_id)
+            .values({request['key']: request['value']})
+            .returning(Offer.offer_id)
+        ).first()
+        if not updated:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Paramètre '{request.key}' non autorisé pour les offres"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Offre '{offer_id}' non trouvée"
             )
-        
-        # Mettre à jour l'offre
-        setattr(offer, request.key, request.value)
         db.commit()
         
         return {
             "success": True,
             "message": f"Offre '{offer_id}' mise à jour avec succès",
             "offer_id": offer_id,
-            "key": request.key,
-            "value": request.value
+            "key": request['key'],
+            "value": request['value']
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erreur mise à jour offre: {e}", exc_info=True)
+        logger.error("Erreur mise à jour offre: %s", e, exc_info=True)
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -228,14 +250,13 @@ async def export_settings(db: Session = Depends(get_db)):
     Exporte tous les paramètres en JSON
     """
     try:
-        settings = await get_settings(db)
-        return {
+        return ORJSONResponse({
             "export_timestamp": "2025-01-19T15:30:00Z",
             "version": "1.0.0",
-            "data": settings.dict()
-        }
+            "data": _build_settings_payload(db)
+        })
     except Exception as e:
-        logger.error(f"Erreur export settings: {e}", exc_info=True)
+        logger.error("Erreur export settings: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'export: {str(e)}"
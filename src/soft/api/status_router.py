@@ -10,11 +10,11 @@ except ImportError:
     print("Warning: psutil not available. Some system metrics will be unavailable.")
 
 import platform
-from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any, List, Optional
 import logging
 import socket
+from ..clock import iso_now
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -115,7 +115,7 @@ async def get_status() -> Dict[str, Any]:
             "platform": system_status.platform,
             "platform_version": system_status.platform_version,
             "python_version": system_status.python_version,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": iso_now()
         }
         
         # Get system metrics
@@ -153,15 +153,15 @@ def get_services_status() -> Dict[str, Dict[str, str]]:
     return {
         "router": {
             "status": "running",
-            "last_check": datetime.now(timezone.utc).isoformat()
+            "last_check": iso_now()
         },
         "autopilot": {
             "status": "idle",
-            "last_check": datetime.now(timezone.utc).isoformat()
+            "last_check": iso_now()
         },
         "probes": {
             "status": "active",
-            "last_check": datetime.now(timezone.utc).isoformat()
+            "last_check": iso_now()
         }
     }
 
@@ -173,4 +173,4 @@ async def health_check() -> Dict[str, str]:
     Returns:
         Basic health status
     """
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+    return {"status": "healthy", "timestamp": iso_now()}
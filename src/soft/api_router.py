@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 import logging
 from typing import List, Dict, Any
-from datetime import datetime, timezone
+from .clock import iso_now
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ async def status_endpoint() -> Dict[str, Any]:
     """Return system status levels suitable for dashboard indicators.
     Levels: active | warning | down
     """
-    now = datetime.now(timezone.utc).isoformat()
+    now = iso_now()
     # In a real impl, compute from subsystems; here we return sane defaults
     return {
         "router": "active",
@@ -59,7 +59,7 @@ async def stats() -> Dict[str, Any]:
 # --- Recent clicks (array, matches frontend expectation) ---
 @api_router.get("/clicks/recent")
 async def recent_clicks(limit: int = 10) -> List[Dict[str, Any]]:
-    now = datetime.now(timezone.utc).isoformat()
+    now = iso_now()
     return [
         {
             "id": f"clk_{i}",
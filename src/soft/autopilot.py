@@ -3,24 +3,30 @@ from __future__ import annotations
 import time
 import math
 import logging
-from typing import List, Optional
+import logging.handlers
+from typing import Dict, List, Optional, Sequence
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from .config import load_policy
-from .storage import epc_for_segment, set_payout_rate, connect, init_db, upsert_segment
+from .config import add_queued_handlers, load_policy
+from .storage import epc_for_segment, set_payout_rates, connect, init_db, upsert_segment
 from .db import SessionLocal, engine
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('autopilot.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Configure console + file logging when the autopilot runs as a process.
+
+    The handlers are driven by the application's shared QueueListener (see
+    config.add_queued_handlers); calling it again is a no-op.
+    """
+    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.FileHandler('autopilot.log', encoding='utf-8', delay=True)
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    return add_queued_handlers(__name__, stream_handler, file_handler)
+
 def segments(session: Session) -> List[str]:
     """Get all segment IDs from the database."""
     try:
@@ -28,27 +34,53 @@ def segments(session: Session) -> List[str]:
         result = session.execute(text("SELECT segment_id FROM segments"))
         return [row[0] for row in result.fetchall()]
     except Exception as e:
-        logger.error(f"Error fetching segments: {e}")
+        logger.error("Error fetching segments: %s", e)
         return []
 
+# Fraud rate for every segment in a single round-trip; compiled once and
+# reused by each autopilot iteration.
+FRAUD_RATE_STMT = text("""
+    SELECT segment_id, AVG(CASE WHEN risk >= :threshold THEN 1.0 ELSE 0.0 END)
+    FROM clicks
+    WHERE ts >= :since
+    GROUP BY segment_id
+""")
+
+def fraud_rates(session: Session, horizon_h: int = 72) -> Dict[str, float]:
+    """Calculate the fraud rate of every segment with recent clicks."""
+    try:
+        since = int(time.time()) - horizon_h * 3600
+        logger.debug("Calculating fraud rates since %s", since)
+
+        result = session.execute(
+            FRAUD_RATE_STMT,
+            {"threshold": POLICY.fraud_threshold, "since": since}
+        )
+        return {seg_id: float(rate or 0.0) for seg_id, rate in result}
+    except Exception as e:
+        logger.error("Error calculating fraud rates: %s", e)
+        return {}
+
+# Fraud rate of one segment, for per-segment callers
+SEGMENT_FRAUD_RATE_STMT = text("""
+    SELECT COALESCE(AVG(CASE WHEN risk >= :threshold THEN 1.0 ELSE 0.0 END), 0.0)
+    FROM clicks
+    WHERE ts >= :since AND segment_id = :seg_id
+""")
+
 def fraud_rate(session: Session, seg_id: str, horizon_h: int = 72) -> float:
     """Calculate fraud rate for a segment."""
     try:
         since = int(time.time()) - horizon_h * 3600
-        logger.debug(f"Calculating fraud rate for segment {seg_id} since {since}")
-        
+        logger.debug("Calculating fraud rate for segment %s since %s", seg_id, since)
+
         result = session.execute(
-            text("""
-                SELECT COALESCE(AVG(CASE WHEN risk >= :threshold THEN 1.0 ELSE 0.0 END), 0.0)
-                FROM clicks 
-                WHERE ts >= :since AND segment_id = :seg_id
-            """),
+            SEGMENT_FRAUD_RATE_STMT,
             {"threshold": POLICY.fraud_threshold, "since": since, "seg_id": seg_id}
         )
-        row = result.fetchone()
-        return float(row[0] or 0.0)
+        return float(result.scalar() or 0.0)
     except Exception as e:
-        logger.error(f"Error calculating fraud rate for segment {seg_id}: {e}")
+        logger.error("Error calculating fraud rate for segment %s: %s", seg_id, e)
         return 0.0
 
 def payout_formula(epc_net: float, fraud_r: float) -> float:
@@ -59,31 +91,45 @@ def payout_formula(epc_net: float, fraud_r: float) -> float:
         raw = POLICY.alpha * epc_net * (1.0 - disc) - POLICY.buffer_eur
         return max(POLICY.min_eur, min(POLICY.max_eur, round(raw, 2)))
     except Exception as e:
-        logger.error(f"Error in payout formula: {e}")
+        logger.error("Error in payout formula: %s", e)
         return POLICY.min_eur
 
+def payout_formula_batch(epcs: Sequence[float], fraud_rs: Sequence[float]) -> np.ndarray:
+    """Vectorized payout_formula over aligned EPC / fraud-rate sequences."""
+    epc = np.asarray(epcs, dtype=np.float64)
+    fr = np.asarray(fraud_rs, dtype=np.float64)
+    raw = POLICY.alpha * epc * (1.0 - POLICY.k_fraud * fr) - POLICY.buffer_eur
+    return np.clip(np.round(raw, 2), POLICY.min_eur, POLICY.max_eur)
+
 def loop_once():
     """Run one iteration of the autopilot loop."""
     session = None
     try:
         session = SessionLocal()
         logger.info("Starting autopilot iteration")
+        rates = fraud_rates(session)
         
+        # A segment whose EPC cannot be computed is skipped; the others still
+        # get their payout in the batch below
+        segs, epcs = [], []
         for seg in segments(session):
             try:
-                logger.info(f"Processing segment: {seg}")
-                # Pass the session to all functions that need it
-                epc = epc_for_segment(seg, horizon_hours=72, db=session)
-                fr = fraud_rate(session, seg)
-                payout = payout_formula(epc, fr)
-                logger.info(f"Setting payout for {seg}: {payout}")
-                set_payout_rate(seg, payout, int(time.time()), db=session)
+                epcs.append(epc_for_segment(seg, horizon_hours=72, db=session))
             except Exception as seg_error:
-                logger.error(f"Error processing segment {seg}: {seg_error}", exc_info=True)
+                logger.error("Error processing segment %s: %s", seg, seg_error, exc_info=True)
                 continue
+            segs.append(seg)
+        payouts = payout_formula_batch(epcs, [rates.get(seg, 0.0) for seg in segs])
+        
+        new_rates = dict(zip(segs, payouts.tolist()))
+        if logger.isEnabledFor(logging.DEBUG):
+            for seg, payout in new_rates.items():
+                logger.debug("Setting payout for %s: %s", seg, payout)
+        logger.info("Setting payouts for %d segments", len(new_rates))
+        set_payout_rates(new_rates, int(time.time()), db=session)
                 
     except Exception as e:
-        logger.error(f"Error in autopilot loop: {e}", exc_info=True)
+        logger.error("Error in autopilot loop: %s", e, exc_info=True)
         if session:
             session.rollback()
     finally:
@@ -93,21 +139,21 @@ def loop_once():
 
 def run_forever(interval_sec: int = 3600):
     """Run the autopilot in an infinite loop."""
-    logger.info(f"Starting autopilot with interval: {interval_sec} seconds")
+    logger.info("Starting autopilot with interval: %s seconds", interval_sec)
     while True:
         try:
             loop_start = time.time()
             loop_once()
             duration = time.time() - loop_start
-            logger.info(f"Payout rates updated @ {time.strftime('%F %T')} (took {duration:.2f}s)")
+            logger.info("Payout rates updated @ %s (took %.2fs)", time.strftime('%F %T'), duration)
         except Exception as e:
-            logger.error(f"Error in autopilot: {e}", exc_info=True)
+            logger.error("Error in autopilot: %s", e, exc_info=True)
         
         # Sleep for the remaining interval time
         time_elapsed = time.time() - loop_start
         sleep_time = max(0, interval_sec - time_elapsed)
         if sleep_time > 0:
-            logger.debug(f"Sleeping for {sleep_time:.2f} seconds")
+            logger.debug("Sleeping for %.2f seconds", sleep_time)
             time.sleep(sleep_time)
 
 # Load policy once at module level
@@ -115,6 +161,7 @@ POLICY = load_policy()
 
 def main():
     """Initialize the database and start the autopilot."""
+    setup_logging()
     logger.info("Starting SmartLinks Autopilot")
     
     # Ensure DB schema and default segments are present
@@ -132,10 +179,10 @@ def main():
                 logger.info("Default segments ensured")
             except Exception as e:
                 session.rollback()
-                logger.error(f"Error ensuring default segments: {e}", exc_info=True)
+                logger.error("Error ensuring default segments: %s", e, exc_info=True)
                 raise
     except Exception as e:
-        logger.critical(f"Failed to initialize database: {e}", exc_info=True)
+        logger.critical("Failed to initialize database: %s", e, exc_info=True)
         return 1
 
     # Start the autopilot
@@ -144,7 +191,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Autopilot stopped by user")
     except Exception as e:
-        logger.critical(f"Fatal error in autopilot: {e}", exc_info=True)
+        logger.critical("Fatal error in autopilot: %s", e, exc_info=True)
         return 1
     
     return 0
@@ -1,18 +1,24 @@
 """Main entry point for the autopilot module."""
 
+import asyncio
+
 from .runner import AlgorithmRunner
-from ..dg.dependencies import get_db_session_factory
+from ..dg.dependencies import get_async_session_factory
 
 def main():
     """Initialize and start the autopilot runner."""
     print("Starting SmartLinks Autopilot...")
     
     # Initialize with database session factory
-    runner = AlgorithmRunner(get_db_session_factory())
+    runner = AlgorithmRunner(get_async_session_factory())
     
-    # For now, just show that the runner is initialized
-    print("Autopilot runner initialized successfully.")
-    print("Algorithm runner is ready to load algorithms.")
+    try:
+        # For now, just show that the runner is initialized
+        print("Autopilot runner initialized successfully.")
+        print("Algorithm runner is ready to load algorithms.")
+    finally:
+        # Flush any queued action audit entries before exiting
+        asyncio.run(runner.close())
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,22 @@
 """FastAPI router for autopilot algorithm settings and AI governance."""
 
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import AsyncIterator, Dict, FrozenSet, List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, insert, select
 import json
-from datetime import datetime
+import time
+import orjson
 
-from .models import AlgorithmSettings, AIPolicy, AuditSettings
+from . import cache
+from ..clock import iso_now, utc_now
+from .models import AlgorithmSettings, AIPolicy, AuditSettings, AuthorityLevel as StoredAuthorityLevel
 from .schemas import (
     ALGORITHM_SETTINGS_MAP,
+    DEFAULT_SETTINGS,
     AIPolicy as AIPolicySchema,
     AlgorithmSettingsResponse,
     AuditEntry,
@@ -17,107 +24,152 @@ from .schemas import (
     PreviewAction,
     AuthorityLevel
 )
-from ..dg.dependencies import get_db
+from ..dg.dependencies import get_async_db, get_async_session_factory
 
 router = APIRouter(prefix="/autopilot", tags=["autopilot"])
 
+# JSON schemas are fixed per settings class: build them once
+_SCHEMA_CACHE: Dict[str, Dict[str, Any]] = {
+    algo_key: settings_class.model_json_schema()
+    for algo_key, settings_class in ALGORITHM_SETTINGS_MAP.items()
+}
+
+# Static algorithm metadata; status and settings info are merged in from the DB
+_ALGORITHM_CATALOG: List[Dict[str, Any]] = [
+    {
+        "key": "traffic_optimizer",
+        "name": "Traffic Optimizer",
+        "description": "Optimizes traffic routing based on CVR, revenue, or CTR",
+        "last_run": "2025-08-20T01:30:00Z",
+        "performance": {"actions_taken": 12, "improvement": "+2.3%"}
+    },
+    {
+        "key": "anomaly_detector", 
+        "name": "Anomaly Detector",
+        "description": "Detects traffic anomalies and triggers mitigations",
+        "last_run": "2025-08-20T01:25:00Z",
+        "performance": {"alerts_sent": 3, "false_positives": "0.5%"}
+    },
+    {
+        "key": "budget_arbitrage",
+        "name": "Budget Arbitrage", 
+        "description": "Reallocates budget based on performance and ROI",
+        "last_run": "2025-08-20T01:20:00Z",
+        "performance": {"budget_moved": "€1,250", "roi_improvement": "+8.1%"}
+    },
+    {
+        "key": "predictive_alerting",
+        "name": "Predictive Alerting",
+        "description": "Predicts issues before they occur",
+        "last_run": "2025-08-20T01:15:00Z",
+        "performance": {"predictions": 5, "accuracy": "87%"}
+    },
+    {
+        "key": "self_healing",
+        "name": "Self-Healing",
+        "description": "Automatically fixes detected issues",
+        "last_run": "2025-08-20T01:10:00Z", 
+        "performance": {"fixes_applied": 2, "success_rate": "95%"}
+    }
+]
+
 
 def get_user_role(x_role: str = Header(default="viewer")) -> str:
     """Simple RBAC based on X-Role header."""
     return x_role.lower()
 
 
-def require_role(required_roles: List[str]):
-    """Dependency to require specific roles."""
+@lru_cache(maxsize=None)
+def require_role(required_roles: FrozenSet[str]):
+    """Dependency to require specific roles (one cached checker per role set)."""
     def check_role(role: str = Depends(get_user_role)):
         if role not in required_roles:
             raise HTTPException(
                 status_code=403,
-                detail=f"Required role: {required_roles}, got: {role}"
+                detail=f"Required role: {sorted(required_roles)}, got: {role}"
             )
         return role
     return check_role
 
 
 @router.get("/algorithms")
-async def list_algorithms(db: Session = Depends(get_db)):
+async def list_algorithms(db: AsyncSession = Depends(get_async_db)):
     """List all algorithms with status and performance metrics."""
-    algorithms = [
-        {
-            "key": "traffic_optimizer",
-            "name": "Traffic Optimizer",
-            "description": "Optimizes traffic routing based on CVR, revenue, or CTR",
-            "status": "active",
-            "last_run": "2025-08-20T01:30:00Z",
-            "performance": {"actions_taken": 12, "improvement": "+2.3%"}
-        },
-        {
-            "key": "anomaly_detector", 
-            "name": "Anomaly Detector",
-            "description": "Detects traffic anomalies and triggers mitigations",
-            "status": "active",
-            "last_run": "2025-08-20T01:25:00Z",
-            "performance": {"alerts_sent": 3, "false_positives": "0.5%"}
-        },
-        {
-            "key": "budget_arbitrage",
-            "name": "Budget Arbitrage", 
-            "description": "Reallocates budget based on performance and ROI",
-            "status": "active",
-            "last_run": "2025-08-20T01:20:00Z",
-            "performance": {"budget_moved": "€1,250", "roi_improvement": "+8.1%"}
-        },
-        {
-            "key": "predictive_alerting",
-            "name": "Predictive Alerting",
-            "description": "Predicts issues before they occur",
-            "status": "active", 
-            "last_run": "2025-08-20T01:15:00Z",
-            "performance": {"predictions": 5, "accuracy": "87%"}
-        },
-        {
-            "key": "self_healing",
-            "name": "Self-Healing",
-            "description": "Automatically fixes detected issues",
-            "status": "active",
-            "last_run": "2025-08-20T01:10:00Z", 
-            "performance": {"fixes_applied": 2, "success_rate": "95%"}
-        }
-    ]
+    # Latest audit timestamp per algorithm, joined onto the stored settings so
+    # that every algorithm is resolved in a single round-trip.
+    latest_audit = (
+        select(
+            AuditSettings.algo_key,
+            func.max(AuditSettings.created_at).label("last_change")
+        )
+        .group_by(AuditSettings.algo_key)
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(
+            AlgorithmSettings.algo_key,
+            AlgorithmSettings.settings_json,
+            AlgorithmSettings.version,
+            latest_audit.c.last_change
+        ).outerjoin(latest_audit, latest_audit.c.algo_key == AlgorithmSettings.algo_key)
+    )).all()
+    stored = {row.algo_key: row for row in rows}
+    
+    algorithms = []
+    for algo in _ALGORITHM_CATALOG:
+        row = stored.get(algo["key"])
+        if row is None:
+            active, version, last_change = True, 0, None
+        else:
+            active = row.settings_json.get("active", True)
+            version = row.version
+            last_change = row.last_change.isoformat() if row.last_change else None
+        algorithms.append({
+            **algo,
+            "status": "active" if active else "inactive",
+            "settings_version": version,
+            "last_settings_change": last_change
+        })
     return {"algorithms": algorithms}
 
 
 @router.get("/algorithms/{algo_key}/settings")
 async def get_algorithm_settings(
     algo_key: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> AlgorithmSettingsResponse:
     """Get algorithm settings with schema and metadata."""
     if algo_key not in ALGORITHM_SETTINGS_MAP:
         raise HTTPException(status_code=404, detail="Algorithm not found")
     
-    # Get settings from database
-    settings_record = db.query(AlgorithmSettings).filter(
-        AlgorithmSettings.algo_key == algo_key
-    ).first()
+    cached = await cache.get_json(cache.settings_key(algo_key))
+    if cached is None:
+        # Get settings from database
+        settings_record = (await db.execute(
+            select(AlgorithmSettings).where(AlgorithmSettings.algo_key == algo_key)
+        )).scalar_one_or_none()
+        if settings_record:
+            cached = {
+                "settings": settings_record.settings_json,
+                "version": settings_record.version,
+                "updated_by": settings_record.updated_by,
+                "updated_at": settings_record.updated_at.isoformat()
+            }
+            await cache.set_json(cache.settings_key(algo_key), cached)
     
-    settings_class = ALGORITHM_SETTINGS_MAP[algo_key]
-    
-    if settings_record:
-        settings = settings_record.settings_json
-        version = settings_record.version
-        updated_by = settings_record.updated_by
-        updated_at = settings_record.updated_at.isoformat()
+    if cached:
+        settings = cached["settings"]
+        version = cached["version"]
+        updated_by = cached["updated_by"]
+        updated_at = cached["updated_at"]
     else:
         # Return defaults
-        default_settings = settings_class()
-        settings = default_settings.dict()
+        settings = DEFAULT_SETTINGS[algo_key]
         version = 0
         updated_by = "system"
-        updated_at = datetime.now().isoformat()
+        updated_at = iso_now()
     
-    # Generate JSON schema
-    schema = settings_class.schema()
+    schema = _SCHEMA_CACHE[algo_key]
     
     return AlgorithmSettingsResponse(
         settings=settings,
@@ -132,8 +184,8 @@ async def get_algorithm_settings(
 async def update_algorithm_settings(
     algo_key: str,
     settings_data: Dict[str, Any],
-    db: Session = Depends(get_db),
-    role: str = Depends(require_role(["admin", "dg_ai"]))
+    db: AsyncSession = Depends(get_async_db),
+    role: str = Depends(require_role(frozenset({"admin", "dg_ai"})))
 ):
     """Update algorithm settings with validation and audit."""
     if algo_key not in ALGORITHM_SETTINGS_MAP:
@@ -143,59 +195,64 @@ async def update_algorithm_settings(
     
     # Validate settings
     try:
-        validated_settings = settings_class(**settings_data)
+        validated_settings = settings_class.model_validate(settings_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid settings: {str(e)}")
     
     # Get current settings for audit
-    current_record = db.query(AlgorithmSettings).filter(
-        AlgorithmSettings.algo_key == algo_key
-    ).first()
+    current_record = (await db.execute(
+        select(AlgorithmSettings).where(AlgorithmSettings.algo_key == algo_key)
+    )).scalar_one_or_none()
     
     current_settings = current_record.settings_json if current_record else {}
-    new_settings = validated_settings.dict()
+    new_settings = validated_settings.model_dump(mode='json')
     
-    # Calculate diff for audit
+    # Calculate diff for audit: added keys plus keys whose value changed,
+    # stored as compact [field, old, new] triples
+    changed_keys = (new_settings.keys() - current_settings.keys()) | {
+        key for key in new_settings.keys() & current_settings.keys()
+        if current_settings[key] != new_settings[key]
+    }
     diff = {
         "before": current_settings,
         "after": new_settings,
-        "changed_fields": []
+        "changed_fields": [
+            [key, current_settings.get(key), new_settings[key]]
+            for key in sorted(changed_keys)
+        ]
     }
     
-    for key, new_value in new_settings.items():
-        if key not in current_settings or current_settings[key] != new_value:
-            diff["changed_fields"].append({
-                "field": key,
-                "old": current_settings.get(key),
-                "new": new_value
-            })
+    now = utc_now()
     
-    # Update or create settings
-    if current_record:
-        current_record.settings_json = new_settings
-        current_record.version += 1
-        current_record.updated_by = role
-        current_record.updated_at = datetime.now()
-    else:
-        current_record = AlgorithmSettings(
+    # Update or create settings; the audit row goes out as a single Core
+    # INSERT in the same transaction
+    with db.no_autoflush:
+        if current_record:
+            current_record.settings_json = new_settings
+            current_record.version += 1
+            current_record.updated_by = role
+            current_record.updated_at = now
+        else:
+            current_record = AlgorithmSettings(
+                algo_key=algo_key,
+                settings_json=new_settings,
+                version=1,
+                updated_by=role,
+                updated_at=now
+            )
+            db.add(current_record)
+    
+    await db.execute(
+        insert(AuditSettings).values(
             algo_key=algo_key,
-            settings_json=new_settings,
-            version=1,
-            updated_by=role,
-            updated_at=datetime.now()
+            actor=role,
+            diff_json=diff,
+            created_at=now
         )
-        db.add(current_record)
-    
-    # Create audit entry
-    audit_entry = AuditSettings(
-        algo_key=algo_key,
-        actor=role,
-        diff_json=diff,
-        created_at=datetime.now()
     )
-    db.add(audit_entry)
     
-    db.commit()
+    await db.commit()
+    await cache.delete(cache.settings_key(algo_key))
     
     return {
         "message": "Settings updated successfully",
@@ -207,21 +264,27 @@ async def update_algorithm_settings(
 @router.get("/ai/policy/{algo_key}")
 async def get_ai_policy(
     algo_key: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> AIPolicySchema:
     """Get AI policy for algorithm or global."""
-    policy_record = db.query(AIPolicy).filter(
-        AIPolicy.algo_key == algo_key
-    ).first()
+    cached = await cache.get_json(cache.policy_key(algo_key))
+    if cached is not None:
+        return AIPolicySchema(**cached)
+    
+    policy_record = (await db.execute(
+        select(AIPolicy).where(AIPolicy.algo_key == algo_key)
+    )).scalar_one_or_none()
     
     if policy_record:
-        return AIPolicySchema(
+        policy = AIPolicySchema(
             authority=policy_record.authority,
             risk_budget_daily=policy_record.risk_budget_daily,
             dry_run=policy_record.dry_run,
             hard_guards=policy_record.hard_guards_json,
             soft_guards=policy_record.soft_guards_json
         )
+        await cache.set_json(cache.policy_key(algo_key), jsonable_encoder(policy))
+        return policy
     else:
         # Return defaults
         return AIPolicySchema()
@@ -231,36 +294,41 @@ async def get_ai_policy(
 async def update_ai_policy(
     algo_key: str,
     policy_data: AIPolicySchema,
-    db: Session = Depends(get_db),
-    role: str = Depends(require_role(["dg_ai"]))
+    db: AsyncSession = Depends(get_async_db),
+    role: str = Depends(require_role(frozenset({"dg_ai"})))
 ):
     """Update AI policy (requires dg_ai role)."""
-    policy_record = db.query(AIPolicy).filter(
-        AIPolicy.algo_key == algo_key
-    ).first()
+    policy_record = (await db.execute(
+        select(AIPolicy).where(AIPolicy.algo_key == algo_key)
+    )).scalar_one_or_none()
+    now = utc_now()
+    # The column stores the model enum; the str-based schema enum would be
+    # written as its value and could not be read back
+    authority = StoredAuthorityLevel(policy_data.authority.value)
     
     if policy_record:
-        policy_record.authority = policy_data.authority
+        policy_record.authority = authority
         policy_record.risk_budget_daily = policy_data.risk_budget_daily
         policy_record.dry_run = policy_data.dry_run
         policy_record.hard_guards_json = policy_data.hard_guards
         policy_record.soft_guards_json = policy_data.soft_guards
         policy_record.updated_by = role
-        policy_record.updated_at = datetime.now()
+        policy_record.updated_at = now
     else:
         policy_record = AIPolicy(
             algo_key=algo_key,
-            authority=policy_data.authority,
+            authority=authority,
             risk_budget_daily=policy_data.risk_budget_daily,
             dry_run=policy_data.dry_run,
             hard_guards_json=policy_data.hard_guards,
             soft_guards_json=policy_data.soft_guards,
             updated_by=role,
-            updated_at=datetime.now()
+            updated_at=now
         )
         db.add(policy_record)
     
-    db.commit()
+    await db.commit()
+    await cache.delete(cache.policy_key(algo_key))
     
     return {"message": "AI policy updated successfully"}
 
@@ -268,8 +336,8 @@ async def update_ai_policy(
 @router.post("/algorithms/{algo_key}/run")
 async def trigger_algorithm_run(
     algo_key: str,
-    db: Session = Depends(get_db),
-    role: str = Depends(require_role(["admin", "dg_ai"]))
+    db: AsyncSession = Depends(get_async_db),
+    role: str = Depends(require_role(frozenset({"admin", "dg_ai"})))
 ):
     """Manually trigger algorithm run."""
     if algo_key not in ALGORITHM_SETTINGS_MAP:
@@ -279,7 +347,7 @@ async def trigger_algorithm_run(
     # For now, return a mock response
     return {
         "message": f"Algorithm {algo_key} run triggered",
-        "run_id": f"run_{algo_key}_{int(datetime.now().timestamp())}",
+        "run_id": f"run_{algo_key}_{int(time.time())}",
         "status": "queued"
     }
 
@@ -288,37 +356,40 @@ async def trigger_algorithm_run(
 async def apply_manual_override(
     algo_key: str,
     override_data: Dict[str, Any],
-    db: Session = Depends(get_db),
-    role: str = Depends(require_role(["operator", "admin"]))
+    db: AsyncSession = Depends(get_async_db),
+    role: str = Depends(require_role(frozenset({"operator", "admin"})))
 ):
     """Apply manual override (doesn't change settings)."""
     if algo_key not in ALGORITHM_SETTINGS_MAP:
         raise HTTPException(status_code=404, detail="Algorithm not found")
     
+    now = utc_now()
+    
     # Log the override for audit
-    audit_entry = AuditSettings(
-        algo_key=algo_key,
-        actor=role,
-        diff_json={
-            "type": "manual_override",
-            "override_data": override_data,
-            "timestamp": datetime.now().isoformat()
-        },
-        created_at=datetime.now()
+    await db.execute(
+        insert(AuditSettings).values(
+            algo_key=algo_key,
+            actor=role,
+            diff_json={
+                "type": "manual_override",
+                "override_data": override_data,
+                "timestamp": now.isoformat()
+            },
+            created_at=now
+        )
     )
-    db.add(audit_entry)
-    db.commit()
+    await db.commit()
     
     return {
         "message": f"Manual override applied to {algo_key}",
-        "override_id": f"override_{algo_key}_{int(datetime.now().timestamp())}"
+        "override_id": f"override_{algo_key}_{int(time.time())}"
     }
 
 
 @router.get("/algorithms/{algo_key}/preview")
 async def preview_algorithm_run(
     algo_key: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> PreviewResponse:
     """Preview algorithm actions without executing."""
     if algo_key not in ALGORITHM_SETTINGS_MAP:
@@ -356,24 +427,45 @@ async def preview_algorithm_run(
     )
 
 
-@router.get("/audit/{algo_key}")
+@router.get(
+    "/audit/{algo_key}",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[AuditEntry], "description": "Audit entries, newest first, streamed as a JSON array"}}
+)
 async def get_audit_history(
     algo_key: str,
-    limit: int = 50,
-    db: Session = Depends(get_db)
-) -> List[AuditEntry]:
-    """Get audit history for algorithm settings."""
-    audit_records = db.query(AuditSettings).filter(
-        AuditSettings.algo_key == algo_key
-    ).order_by(desc(AuditSettings.created_at)).limit(limit).all()
-    
-    return [
-        AuditEntry(
-            id=record.id,
-            algo_key=record.algo_key,
-            actor=record.actor,
-            diff_json=record.diff_json,
-            created_at=record.created_at.isoformat()
+    limit: int = 50
+) -> StreamingResponse:
+    """Get audit history for algorithm settings, streamed as a JSON array."""
+    stmt = (
+        select(
+            AuditSettings.id,
+            AuditSettings.algo_key,
+            AuditSettings.actor,
+            AuditSettings.diff_json,
+            AuditSettings.created_at,
         )
-        for record in audit_records
-    ]
+        .where(AuditSettings.algo_key == algo_key)
+        .order_by(desc(AuditSettings.created_at))
+        .limit(limit)
+        .execution_options(yield_per=100)
+    )
+    
+    async def generate() -> AsyncIterator[bytes]:
+        # The request-scoped session is closed before a streaming body runs,
+        # so the generator owns its session for the lifetime of the cursor
+        async with get_async_session_factory()() as db:
+            result = await db.stream(stmt)
+            separator = b"["
+            async for row in result:
+                yield separator + orjson.dumps({
+                    "id": row.id,
+                    "algo_key": row.algo_key,
+                    "actor": row.actor,
+                    "diff_json": row.diff_json,
+                    "created_at": row.created_at.isoformat()
+                }, option=orjson.OPT_NON_STR_KEYS)
+                separator = b","
+            yield b"[]" if separator == b"[" else b"]"
+    
+    return StreamingResponse(generate(), media_type="application/json")
@@ -1,38 +1,58 @@
 """Thompson Sampling bandit implementation."""
 
+import os
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence
 from dataclasses import dataclass
-from ..observability.otel import trace_function
+from ...clock import iso_now
+from ...observability.otel import trace_function
 
 @dataclass
 class BanditArm:
-    """Bandit arm with Beta distribution parameters."""
+    """Bandit arm metadata; Beta parameters live in the bandit's arrays."""
     destination_id: str
-    alpha: float = 1.0  # Success count + 1
-    beta: float = 1.0   # Failure count + 1
+    index: int          # Slot in the owning bandit's per-arm arrays
     weight: float = 0.0
     last_updated: Optional[str] = None
 
 class ThompsonBandit:
-    """Thompson Sampling bandit for traffic optimization."""
+    """Thompson Sampling bandit for traffic optimization.
+    
+    Beta parameters are stored as two parallel float64 arrays (one slot per
+    arm, grown by doubling) so that sampling every arm is a single vectorized
+    draw instead of one NumPy call per destination.
+    """
     
     def __init__(self, alpha0: float = 1.0, beta0: float = 1.0, 
-                 min_weight: float = 0.01, max_weight: float = 0.8):
+                 min_weight: float = 0.01, max_weight: float = 0.8,
+                 seed: Optional[int] = None):
         self.alpha0 = alpha0  # Prior alpha
         self.beta0 = beta0    # Prior beta
         self.min_weight = min_weight
         self.max_weight = max_weight
         self.arms: Dict[str, BanditArm] = {}
+        self._alpha = np.empty(8, dtype=np.float64)  # Success count + alpha0
+        self._beta = np.empty(8, dtype=np.float64)   # Failure count + beta0
+        # Per-instance PCG64 generator: no shared global RandomState lock.
+        # Seeded from os.urandom unless a seed is given for reproducibility.
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self._rng = np.random.default_rng(seed)
     
     def add_arm(self, destination_id: str, initial_weight: float = 0.1):
         """Add a new bandit arm."""
-        self.arms[destination_id] = BanditArm(
-            destination_id=destination_id,
-            alpha=self.alpha0,
-            beta=self.beta0,
-            weight=initial_weight
-        )
+        arm = self.arms.get(destination_id)
+        if arm is None:
+            index = len(self.arms)
+            if index == len(self._alpha):
+                self._alpha = np.resize(self._alpha, 2 * index)
+                self._beta = np.resize(self._beta, 2 * index)
+            arm = BanditArm(destination_id=destination_id, index=index)
+            self.arms[destination_id] = arm
+        arm.weight = initial_weight
+        arm.last_updated = None
+        self._alpha[arm.index] = self.alpha0
+        self._beta[arm.index] = self.beta0
     
     def update_arm(self, destination_id: str, successes: int, failures: int):
         """Update arm with new observations."""
@@ -40,61 +60,80 @@ class ThompsonBandit:
             self.add_arm(destination_id)
         
         arm = self.arms[destination_id]
-        arm.alpha += successes
-        arm.beta += failures
-        arm.last_updated = np.datetime64('now').astype(str)
+        self._alpha[arm.index] += successes
+        self._beta[arm.index] += failures
+        arm.last_updated = iso_now()
+    
+    def batch_update(self, destination_ids: Sequence[str], successes: Sequence[int],
+                     failures: Sequence[int]):
+        """Apply many observations at once; repeated destinations accumulate."""
+        for dest_id in destination_ids:
+            if dest_id not in self.arms:
+                self.add_arm(dest_id)
+        
+        idx = np.fromiter((self.arms[dest_id].index for dest_id in destination_ids),
+                          dtype=np.intp, count=len(destination_ids))
+        successes = np.asarray(successes, dtype=np.float64)
+        failures = np.asarray(failures, dtype=np.float64)
+        changed = (successes != 0) | (failures != 0)
+        if not changed.any():
+            return
+        
+        idx = idx[changed]
+        np.add.at(self._alpha, idx, successes[changed])
+        np.add.at(self._beta, idx, failures[changed])
+        now_iso = iso_now()
+        for dest_id, is_changed in zip(destination_ids, changed.tolist()):
+            if is_changed:
+                self.arms[dest_id].last_updated = now_iso
     
     @trace_function("bandits.thompson.select")
     def select_weights(self, destination_ids: List[str], 
                       total_weight: float = 1.0) -> Dict[str, float]:
         """Select weights using Thompson Sampling."""
+        if not destination_ids:
+            return {}
         
         # Ensure all destinations have arms
         for dest_id in destination_ids:
             if dest_id not in self.arms:
                 self.add_arm(dest_id)
         
-        # Sample from Beta distributions
-        samples = {}
-        for dest_id in destination_ids:
-            arm = self.arms[dest_id]
-            # Sample from Beta(alpha, beta)
-            sample = np.random.beta(arm.alpha, arm.beta)
-            samples[dest_id] = sample
+        # Sample every Beta(alpha, beta) in one draw
+        idx = np.fromiter((self.arms[dest_id].index for dest_id in destination_ids),
+                          dtype=np.intp, count=len(destination_ids))
+        samples = self._rng.beta(self._alpha[idx], self._beta[idx])
         
         # Normalize samples to weights
-        total_sample = sum(samples.values())
+        total_sample = samples.sum()
         if total_sample == 0:
             # Fallback to uniform distribution
             weight_per_dest = total_weight / len(destination_ids)
             return {dest_id: weight_per_dest for dest_id in destination_ids}
         
-        weights = {}
-        for dest_id in destination_ids:
-            raw_weight = (samples[dest_id] / total_sample) * total_weight
-            # Apply bounds
-            weights[dest_id] = np.clip(raw_weight, self.min_weight, self.max_weight)
-        
-        # Renormalize to ensure sum equals total_weight
-        current_total = sum(weights.values())
+        # Apply bounds, then renormalize to ensure sum equals total_weight
+        weights = samples * (total_weight / total_sample)
+        np.clip(weights, self.min_weight, self.max_weight, out=weights)
+        current_total = weights.sum()
         if current_total > 0:
-            for dest_id in weights:
-                weights[dest_id] = (weights[dest_id] / current_total) * total_weight
+            weights *= total_weight / current_total
         
-        return weights
+        return dict(zip(destination_ids, weights.tolist()))
     
     def get_arm_stats(self, destination_id: str) -> Dict[str, float]:
         """Get statistics for an arm."""
         if destination_id not in self.arms:
             return {"alpha": self.alpha0, "beta": self.beta0, "mean": 0.5, "variance": 0.083}
         
-        arm = self.arms[destination_id]
-        mean = arm.alpha / (arm.alpha + arm.beta)
-        variance = (arm.alpha * arm.beta) / ((arm.alpha + arm.beta)**2 * (arm.alpha + arm.beta + 1))
+        index = self.arms[destination_id].index
+        alpha = float(self._alpha[index])
+        beta = float(self._beta[index])
+        mean = alpha / (alpha + beta)
+        variance = (alpha * beta) / ((alpha + beta)**2 * (alpha + beta + 1))
         
         return {
-            "alpha": arm.alpha,
-            "beta": arm.beta,
+            "alpha": alpha,
+            "beta": beta,
             "mean": mean,
             "variance": variance,
             "confidence_95": np.sqrt(variance) * 1.96
@@ -102,97 +141,114 @@ class ThompsonBandit:
     
     def get_all_stats(self) -> Dict[str, Dict[str, float]]:
         """Get statistics for all arms."""
-        return {dest_id: self.get_arm_stats(dest_id) for dest_id in self.arms}
+        # Arms occupy slots 0..n-1 in insertion order, matching self.arms
+        n = len(self.arms)
+        alpha = self._alpha[:n]
+        beta = self._beta[:n]
+        ab = alpha + beta
+        mean = alpha / ab
+        variance = (alpha * beta) / (ab * ab * (ab + 1))
+        confidence = np.sqrt(variance) * 1.96
+        
+        return {
+            dest_id: {"alpha": a, "beta": b, "mean": m, "variance": v, "confidence_95": c}
+            for dest_id, a, b, m, v, c in zip(
+                self.arms, alpha.tolist(), beta.tolist(), mean.tolist(),
+                variance.tolist(), confidence.tolist()
+            )
+        }
 
 class UCBBandit:
-    """Upper Confidence Bound bandit implementation."""
+    """Upper Confidence Bound bandit implementation.
+    
+    Like ThompsonBandit, per-arm statistics live in parallel arrays
+    (total reward, pull count) so UCB scores are computed in one vector pass.
+    """
     
     def __init__(self, c: float = 1.0, min_weight: float = 0.01, max_weight: float = 0.8):
         self.c = c  # Exploration parameter
         self.min_weight = min_weight
         self.max_weight = max_weight
-        self.arms: Dict[str, Dict] = {}
+        self.arms: Dict[str, BanditArm] = {}
+        self._reward = np.empty(8, dtype=np.float64)  # Total reward per arm
+        self._pulls = np.empty(8, dtype=np.int64)     # Number of pulls per arm
         self.total_rounds = 0
     
     def add_arm(self, destination_id: str, initial_weight: float = 0.1):
         """Add a new bandit arm."""
-        self.arms[destination_id] = {
-            "total_reward": 0.0,
-            "num_pulls": 0,
-            "weight": initial_weight
-        }
+        arm = self.arms.get(destination_id)
+        if arm is None:
+            index = len(self.arms)
+            if index == len(self._reward):
+                self._reward = np.resize(self._reward, 2 * index)
+                self._pulls = np.resize(self._pulls, 2 * index)
+            arm = BanditArm(destination_id=destination_id, index=index)
+            self.arms[destination_id] = arm
+        arm.weight = initial_weight
+        self._reward[arm.index] = 0.0
+        self._pulls[arm.index] = 0
     
     def update_arm(self, destination_id: str, reward: float):
         """Update arm with reward."""
         if destination_id not in self.arms:
             self.add_arm(destination_id)
         
-        arm = self.arms[destination_id]
-        arm["total_reward"] += reward
-        arm["num_pulls"] += 1
+        index = self.arms[destination_id].index
+        self._reward[index] += reward
+        self._pulls[index] += 1
         self.total_rounds += 1
     
     @trace_function("bandits.ucb.select")
     def select_weights(self, destination_ids: List[str], 
                       total_weight: float = 1.0) -> Dict[str, float]:
         """Select weights using UCB."""
+        if not destination_ids:
+            return {}
         
         # Ensure all destinations have arms
         for dest_id in destination_ids:
             if dest_id not in self.arms:
                 self.add_arm(dest_id)
         
-        # Calculate UCB values
-        ucb_values = {}
-        for dest_id in destination_ids:
-            arm = self.arms[dest_id]
-            
-            if arm["num_pulls"] == 0:
-                # Unplayed arm gets infinite UCB
-                ucb_values[dest_id] = float('inf')
-            else:
-                mean_reward = arm["total_reward"] / arm["num_pulls"]
-                confidence = self.c * np.sqrt(np.log(self.total_rounds) / arm["num_pulls"])
-                ucb_values[dest_id] = mean_reward + confidence
-        
-        # Convert UCB values to weights
-        if any(v == float('inf') for v in ucb_values.values()):
-            # If any arm is unplayed, distribute weight equally among unplayed arms
-            unplayed = [dest_id for dest_id, v in ucb_values.items() if v == float('inf')]
-            weight_per_unplayed = total_weight / len(unplayed)
-            weights = {dest_id: 0.0 for dest_id in destination_ids}
-            for dest_id in unplayed:
-                weights[dest_id] = weight_per_unplayed
-        else:
-            # Softmax transformation of UCB values
-            exp_values = {dest_id: np.exp(ucb_values[dest_id]) for dest_id in destination_ids}
-            total_exp = sum(exp_values.values())
-            
-            weights = {}
-            for dest_id in destination_ids:
-                raw_weight = (exp_values[dest_id] / total_exp) * total_weight
-                weights[dest_id] = np.clip(raw_weight, self.min_weight, self.max_weight)
-            
-            # Renormalize
-            current_total = sum(weights.values())
-            if current_total > 0:
-                for dest_id in weights:
-                    weights[dest_id] = (weights[dest_id] / current_total) * total_weight
+        idx = np.fromiter((self.arms[dest_id].index for dest_id in destination_ids),
+                          dtype=np.intp, count=len(destination_ids))
+        pulls = self._pulls[idx]
         
-        return weights
+        # Unplayed arms have infinite UCB: split the weight equally among them
+        unplayed = pulls == 0
+        if unplayed.any():
+            weights = unplayed * (total_weight / np.count_nonzero(unplayed))
+            return dict(zip(destination_ids, weights.tolist()))
+        
+        # Calculate UCB values for every arm at once
+        ucb = self._reward[idx] / pulls + self.c * np.sqrt(np.log(self.total_rounds) / pulls)
+        
+        # Softmax transformation of UCB values, in place on one buffer
+        # (shifted by the max so large UCB values cannot overflow exp)
+        weights = np.exp(ucb - ucb.max())
+        weights *= total_weight / weights.sum()
+        np.clip(weights, self.min_weight, self.max_weight, out=weights)
+        
+        # Renormalize
+        current_total = weights.sum()
+        if current_total > 0:
+            weights *= total_weight / current_total
+        
+        return dict(zip(destination_ids, weights.tolist()))
     
     def get_arm_stats(self, destination_id: str) -> Dict[str, float]:
         """Get statistics for an arm."""
         if destination_id not in self.arms:
             return {"mean_reward": 0.0, "num_pulls": 0, "confidence": 0.0}
         
-        arm = self.arms[destination_id]
-        mean_reward = arm["total_reward"] / arm["num_pulls"] if arm["num_pulls"] > 0 else 0.0
-        confidence = self.c * np.sqrt(np.log(self.total_rounds) / arm["num_pulls"]) if arm["num_pulls"] > 0 else float('inf')
+        index = self.arms[destination_id].index
+        num_pulls = int(self._pulls[index])
+        mean_reward = float(self._reward[index]) / num_pulls if num_pulls > 0 else 0.0
+        confidence = self.c * np.sqrt(np.log(self.total_rounds) / num_pulls) if num_pulls > 0 else float('inf')
         
         return {
             "mean_reward": mean_reward,
-            "num_pulls": arm["num_pulls"],
+            "num_pulls": num_pulls,
             "confidence": confidence,
             "ucb_value": mean_reward + confidence
         }
@@ -217,13 +273,16 @@ class BanditTrafficOptimizer:
         """Optimize traffic allocation using bandits."""
         
         # Update bandit with historical data
-        for dest_id, data in historical_data.items():
-            if self.algorithm == "thompson":
-                successes = data.get("conversions", 0)
-                total = data.get("visits", 1)
-                failures = max(0, total - successes)
-                self.bandit.update_arm(dest_id, successes, failures)
-            elif self.algorithm == "ucb":
+        if self.algorithm == "thompson":
+            n = len(historical_data)
+            successes = np.fromiter((data.get("conversions", 0) for data in historical_data.values()),
+                                    dtype=np.float64, count=n)
+            visits = np.fromiter((data.get("visits", 1) for data in historical_data.values()),
+                                 dtype=np.float64, count=n)
+            failures = np.maximum(visits - successes, 0)
+            self.bandit.batch_update(list(historical_data), successes, failures)
+        elif self.algorithm == "ucb":
+            for dest_id, data in historical_data.items():
                 reward = data.get("cvr", 0.0)  # Use CVR as reward
                 self.bandit.update_arm(dest_id, reward)
         
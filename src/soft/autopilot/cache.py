@@ -0,0 +1,101 @@
+"""Cache-aside helpers for autopilot settings and AI policies.
+
+Reads go through a small in-process (L1) cache first, then Redis when
+``REDIS_URL`` is configured. Writers call :func:`delete` after committing so
+the next read repopulates from the database. Redis failures are logged and
+treated as cache misses: the cache never fails a request.
+"""
+
+import os
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+DEFAULT_TTL_SECONDS = 3600
+# Other workers only see invalidations through Redis, so keep L1 short-lived
+L1_TTL_SECONDS = int(os.getenv("AUTOPILOT_L1_CACHE_TTL", "30"))
+
+_l1: Dict[str, Tuple[float, Any]] = {}
+_redis_client = None
+
+
+def settings_key(algo_key: str) -> str:
+    return f"algo:{algo_key}:settings"
+
+
+def policy_key(algo_key: str) -> str:
+    return f"policy:{algo_key}"
+
+
+def _get_redis():
+    """Lazily create the pooled Redis client, or None when not configured."""
+    global _redis_client
+    if _redis_client is None and REDIS_AVAILABLE and REDIS_URL:
+        _redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+async def get_json(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss."""
+    entry = _l1.get(key)
+    if entry is not None:
+        expires_at, value = entry
+        if expires_at > time.monotonic():
+            return value
+        _l1.pop(key, None)
+
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        logger.warning("Redis get failed for %s: %s", key, e)
+        return None
+    if raw is None:
+        return None
+    value = orjson.loads(raw)
+    _l1[key] = (time.monotonic() + L1_TTL_SECONDS, value)
+    return value
+
+
+async def set_json(key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> None:
+    """Store a JSON-serializable value in both cache levels."""
+    _l1[key] = (time.monotonic() + min(ttl, L1_TTL_SECONDS), value)
+
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS), ex=ttl)
+    except Exception as e:
+        logger.warning("Redis set failed for %s: %s", key, e)
+
+
+async def delete(key: str) -> None:
+    """Invalidate key in both cache levels."""
+    _l1.pop(key, None)
+
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(key)
+    except Exception as e:
+        logger.warning("Redis delete failed for %s: %s", key, e)
+
+
+def clear_local() -> None:
+    """Drop every in-process entry (tests, manual resets)."""
+    _l1.clear()
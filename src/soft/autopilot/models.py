@@ -3,11 +3,15 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Enum, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Binary JSONB on PostgreSQL (decomposed once, GIN-indexable), plain JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class AuthorityLevel(PyEnum):
     """AI authority levels for algorithm governance."""
@@ -42,14 +46,15 @@ class AIPolicy(Base):
     authority = Column(Enum(AuthorityLevel), nullable=False, default=AuthorityLevel.SAFE_APPLY)
     risk_budget_daily = Column(Integer, nullable=False, default=3)
     dry_run = Column(Boolean, nullable=False, default=False)
-    hard_guards_json = Column(JSON, nullable=False)
-    soft_guards_json = Column(JSON, nullable=False)
+    hard_guards_json = Column(JSONDocument, nullable=False)
+    soft_guards_json = Column(JSONDocument, nullable=False)
     updated_by = Column(String(100), nullable=False)
     updated_at = Column(DateTime, nullable=False, server_default=func.now())
     
     __table_args__ = (
         UniqueConstraint('algo_key', name='uq_ai_policies_algo_key'),
         Index('ix_ai_policies_algo_key', 'algo_key'),
+        Index('ix_ai_policies_hard_guards_gin', 'hard_guards_json', postgresql_using='gin'),
     )
 
 
@@ -60,12 +65,16 @@ class AuditSettings(Base):
     id = Column(Integer, primary_key=True)
     algo_key = Column(String(50), nullable=False)
     actor = Column(String(100), nullable=False)
-    diff_json = Column(JSON, nullable=False)
+    diff_json = Column(JSONDocument, nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     
     __table_args__ = (
-        Index('ix_audit_settings_algo_key', 'algo_key'),
+        Index('ix_audit_settings_diff_json_gin', 'diff_json', postgresql_using='gin'),
         Index('ix_audit_settings_created_at', 'created_at'),
+        # Leading algo_key also serves plain algo_key lookups; actor is carried
+        # in the leaf so history scans stay index-only on PostgreSQL
+        Index('ix_audit_settings_algo_key_created_at', 'algo_key', 'created_at',
+              postgresql_include=['actor']),
     )
 
 
@@ -1,12 +1,13 @@
-"""Budget Arbitrage optimizer using OR-Tools LP/QP solver."""
+"""Budget Arbitrage and traffic weight optimizers (continuous knapsack allocations)."""
 
+import asyncio
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from ortools.linear_solver import pywraplp
-from ..observability.otel import trace_function
+import numpy as np
+from ...observability.otel import trace_function
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationConstraint:
     """Optimization constraint definition."""
     name: str
@@ -14,7 +15,7 @@ class OptimizationConstraint:
     coefficients: Dict[str, float]
     bound: float
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationResult:
     """Optimization result."""
     success: bool
@@ -25,11 +26,119 @@ class OptimizationResult:
     constraints_satisfied: bool
     fallback_used: bool = False
 
-class BudgetArbitrageOptimizer:
-    """Budget arbitrage optimizer using OR-Tools."""
+def _column(items: List[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+    """Extract one field of every item into a float64 array."""
+    return np.fromiter((item.get(key, default) for item in items), dtype=np.float64, count=len(items))
+
+def _candidates_to_arrays(candidates: List[Dict[str, Any]], total_budget: float) -> Dict[str, np.ndarray]:
+    """Extract candidate fields into parallel float64 arrays (one pass per field)."""
+    def column(key: str, default: float) -> np.ndarray:
+        return _column(candidates, key, default)
+    
+    return {
+        "min_budget": column("min_budget", 0),
+        "max_budget": column("max_budget", total_budget),
+        "current_budget": column("current_budget", 0.0),
+        "expected_roi": column("expected_roi", 0.0),
+        "conversion_rate": column("conversion_rate", 0.0),
+        "cost_per_click": column("cost_per_click", 1.0),
+        "revenue_per_conversion": column("revenue_per_conversion", 0.0),
+    }
+
+def _solve_linear_knapsack(coefficients: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                           total: float) -> Optional[np.ndarray]:
+    """Closed-form optimum of max c.x s.t. sum(x) == total, lo <= x <= hi.
+    
+    Continuous knapsack (water-filling): start every item at its lower bound,
+    then fill the remaining total into items by decreasing coefficient. Returns
+    None when the bounds cannot sum to total.
+    """
+    tolerance = 1e-9 * max(1.0, abs(total))
+    room = hi - lo
+    remaining = total - lo.sum()
+    if (room < 0).any() or remaining < -tolerance or remaining > room.sum() + tolerance:
+        return None
+    
+    order = np.argsort(-coefficients, kind='stable')
+    room_sorted = room[order]
+    filled_before = np.cumsum(room_sorted) - room_sorted
+    allocation = lo.copy()
+    allocation[order] += np.clip(remaining - filled_before, 0.0, room_sorted)
+    return allocation
+
+def _fallback_allocate(scores: np.ndarray, lo: np.ndarray, hi: np.ndarray, total: float) -> np.ndarray:
+    """Heuristic allocation of total proportionally to the positive scores.
+    
+    Items with a positive score get their share clipped to [lo, hi], the others
+    get lo; without any positive score the total is split equally. The result
+    is then rescaled to sum to total, unless clipping left the sum unchanged.
+    """
+    positive = scores > 0
+    total_score = scores[positive].sum()
+    if total_score > 0:
+        share = scores * (total / total_score)
+        allocation = np.where(positive, np.maximum(lo, np.minimum(hi, share)), lo)
+    else:
+        allocation = np.full(len(scores), total / len(scores))
+    
+    current_total = allocation.sum()
+    if current_total > 0 and abs(current_total - total) > 1e-9 * abs(total):
+        allocation *= total / current_total
+    return allocation
+
+def _trivial_result(variables: Dict[str, float], objective_value: float,
+                    start_time: float, feasible: bool = True) -> OptimizationResult:
+    """Result for degenerate inputs whose answer is known without solving.
+    
+    With feasible=False the bounds rule out any allocation and the result is
+    reported as an unsuccessful INFEASIBLE solve.
+    """
+    return OptimizationResult(
+        success=feasible,
+        objective_value=objective_value,
+        variables=variables,
+        solver_status="TRIVIAL" if feasible else "INFEASIBLE",
+        solve_time_ms=(time.perf_counter() - start_time) * 1000,
+        constraints_satisfied=feasible
+    )
+
+class _SumModelOptimizer:
+    """Shared solve path: max c.x s.t. sum(x) == total, lo <= x <= hi.
+    
+    solver_timeout_s is accepted for compatibility and ignored: the closed-form
+    solve has no time limit to apply.
+    """
+    
+    # Constraint values used when a request does not set them
+    DEFAULT_CONSTRAINTS: Dict[str, Any] = {}
+    
+    def __init__(self, solver_timeout_s: float = 0.5,
+                 default_constraints: Optional[Dict[str, Any]] = None):
+        self._defaults = {**self.DEFAULT_CONSTRAINTS, **(default_constraints or {})}
+    
+    def _solve_bounded_linear(self, names: List[str], coefficients: np.ndarray, lo: np.ndarray,
+                              hi: np.ndarray, total: float, start_time: float) -> Optional[OptimizationResult]:
+        """Solve the allocation model in closed form, or return None if infeasible.
+        
+        Every objective is linear with box bounds and a single sum constraint,
+        so the water-filling kernel gives the LP optimum directly.
+        """
+        allocation = _solve_linear_knapsack(coefficients, lo, hi, total)
+        if allocation is None:
+            return None
+        return OptimizationResult(
+            success=True,
+            objective_value=float(coefficients @ allocation),
+            variables=dict(zip(names, allocation.tolist())),
+            solver_status="OPTIMAL",
+            solve_time_ms=(time.perf_counter() - start_time) * 1000,
+            constraints_satisfied=True
+        )
+
+class BudgetArbitrageOptimizer(_SumModelOptimizer):
+    """Budget arbitrage optimizer (closed-form linear allocation)."""
     
-    def __init__(self, solver_timeout_s: float = 0.5):
-        self.solver_timeout_s = solver_timeout_s
+    DEFAULT_CONSTRAINTS = {'max_reallocation_step': 0.1, 'min_roi': 0.0}
     
     @trace_function("optimizer.solve")
     async def optimize_budget_allocation(
@@ -39,198 +148,129 @@ class BudgetArbitrageOptimizer:
         constraints: Dict[str, Any],
         objective: str = "maximize_conversions"
     ) -> OptimizationResult:
-        """Optimize budget allocation across candidates."""
+        """Optimize budget allocation across candidates (solved in a worker thread)."""
+        return await asyncio.to_thread(
+            self._optimize_budget_sync, candidates, total_budget, constraints, objective
+        )
+    
+    def _optimize_budget_sync(
+        self,
+        candidates: List[Dict[str, Any]],
+        total_budget: float,
+        constraints: Dict[str, Any],
+        objective: str
+    ) -> OptimizationResult:
+        """Blocking body of optimize_budget_allocation."""
         
-        start_time = time.time()
+        start_time = time.perf_counter()
+        names = [f"budget_{candidate.get('id', i)}" for i, candidate in enumerate(candidates)]
+        
+        # No candidates: skip the solver entirely
+        if not candidates:
+            return _trivial_result({}, 0.0, start_time)
+        
+        constraints = {**self._defaults, **constraints}
         
         try:
-            # Create solver
-            solver = pywraplp.Solver.CreateSolver('SCIP')
-            if not solver:
-                return self._fallback_solution(candidates, total_budget, start_time)
-            
-            # Set timeout
-            solver.SetTimeLimit(int(self.solver_timeout_s * 1000))
+            # Extract candidate data once, then derive bounds and coefficients
+            # as whole-array expressions
+            data = _candidates_to_arrays(candidates, total_budget)
             
-            # Create variables
-            variables = {}
-            for i, candidate in enumerate(candidates):
-                var_name = f"budget_{candidate.get('id', i)}"
-                min_budget = candidate.get('min_budget', 0)
-                max_budget = candidate.get('max_budget', total_budget)
-                variables[var_name] = solver.NumVar(min_budget, max_budget, var_name)
+            # Reallocation step: limit change from current allocation, intersected
+            # with each candidate's own [min_budget, max_budget]
+            max_step = constraints['max_reallocation_step']
+            current_budget = data["current_budget"]
+            max_change = current_budget * max_step
+            min_new_budget = np.maximum(np.maximum(data["min_budget"], 0),
+                                        current_budget - max_change)
+            max_new_budget = np.minimum(np.minimum(data["max_budget"], total_budget),
+                                        current_budget + max_change)
             
-            # Budget constraint: sum of all budgets = total_budget
-            budget_constraint = solver.Constraint(total_budget, total_budget, 'total_budget')
-            for var in variables.values():
-                budget_constraint.SetCoefficient(var, 1.0)
-            
-            # ROI constraints
-            min_roi = constraints.get('min_roi', 0.0)
+            # ROI constraints: candidates below min_roi are forced to zero budget,
+            # i.e. their step bounds are intersected with [0, 0]
+            min_roi = constraints['min_roi']
             if min_roi > 0:
-                for i, candidate in enumerate(candidates):
-                    var_name = f"budget_{candidate.get('id', i)}"
-                    expected_roi = candidate.get('expected_roi', 0.0)
-                    if expected_roi < min_roi:
-                        # Force this candidate to have zero budget
-                        roi_constraint = solver.Constraint(0, 0, f'roi_{var_name}')
-                        roi_constraint.SetCoefficient(variables[var_name], 1.0)
-            
-            # Reallocation step constraints
-            max_step = constraints.get('max_reallocation_step', 0.1)
-            for i, candidate in enumerate(candidates):
-                var_name = f"budget_{candidate.get('id', i)}"
-                current_budget = candidate.get('current_budget', 0.0)
-                
-                # Limit change from current allocation
-                max_change = current_budget * max_step
-                min_new_budget = max(0, current_budget - max_change)
-                max_new_budget = min(total_budget, current_budget + max_change)
-                
-                # Update variable bounds
-                variables[var_name].SetBounds(min_new_budget, max_new_budget)
+                max_new_budget = np.where(
+                    data["expected_roi"] < min_roi, np.minimum(max_new_budget, 0), max_new_budget
+                )
             
-            # Movement frequency constraints
-            max_moves_per_hour = constraints.get('max_moves_per_hour', 10)
-            # This would require historical data - simplified for now
+            # Movement frequency constraints (max_moves_per_hour) are not enforced:
+            # they would require historical move data
             
-            # Set objective
-            objective_expr = solver.Objective()
+            # Nothing to allocate: all-zero budgets, unless a lower bound
+            # (min_budget or the reallocation step) requires spending
+            if total_budget <= 0:
+                feasible = total_budget == 0 and not (min_new_budget > 0).any()
+                return _trivial_result(dict.fromkeys(names, 0.0), 0.0, start_time, feasible)
             
+            # Objective coefficients
+            cost_per_click = data["cost_per_click"]
+            positive_cpc = cost_per_click > 0
+            safe_cpc = np.where(positive_cpc, cost_per_click, 1.0)
             if objective == "maximize_conversions":
-                for i, candidate in enumerate(candidates):
-                    var_name = f"budget_{candidate.get('id', i)}"
-                    conversion_rate = candidate.get('conversion_rate', 0.0)
-                    cost_per_click = candidate.get('cost_per_click', 1.0)
-                    
-                    # Conversions = (budget / cost_per_click) * conversion_rate
-                    conversion_coefficient = conversion_rate / cost_per_click if cost_per_click > 0 else 0
-                    objective_expr.SetCoefficient(variables[var_name], conversion_coefficient)
-                
-                objective_expr.SetMaximization()
-            
+                # Conversions = (budget / cost_per_click) * conversion_rate
+                coefficients = np.where(positive_cpc, data["conversion_rate"] / safe_cpc, 0.0)
             elif objective == "maximize_revenue":
-                for i, candidate in enumerate(candidates):
-                    var_name = f"budget_{candidate.get('id', i)}"
-                    revenue_per_conversion = candidate.get('revenue_per_conversion', 0.0)
-                    conversion_rate = candidate.get('conversion_rate', 0.0)
-                    cost_per_click = candidate.get('cost_per_click', 1.0)
-                    
-                    # Revenue = conversions * revenue_per_conversion
-                    revenue_coefficient = (conversion_rate * revenue_per_conversion) / cost_per_click if cost_per_click > 0 else 0
-                    objective_expr.SetCoefficient(variables[var_name], revenue_coefficient)
-                
-                objective_expr.SetMaximization()
-            
-            # Solve
-            status = solver.Solve()
-            solve_time_ms = (time.time() - start_time) * 1000
-            
-            if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-                # Extract solution
-                solution = {}
-                for var_name, var in variables.items():
-                    solution[var_name] = var.solution_value()
-                
-                return OptimizationResult(
-                    success=True,
-                    objective_value=solver.Objective().Value(),
-                    variables=solution,
-                    solver_status=self._get_status_string(status),
-                    solve_time_ms=solve_time_ms,
-                    constraints_satisfied=True
+                # Revenue = conversions * revenue_per_conversion
+                coefficients = np.where(
+                    positive_cpc,
+                    data["conversion_rate"] * data["revenue_per_conversion"] / safe_cpc,
+                    0.0
                 )
-            
             else:
-                # Solver failed, use fallback
-                return self._fallback_solution(candidates, total_budget, start_time)
+                coefficients = np.zeros(len(names))
+            
+            # Budgets must sum to total_budget; a single candidate takes the
+            # whole budget if its bounds allow
+            result = self._solve_bounded_linear(
+                names, coefficients, min_new_budget, max_new_budget, total_budget, start_time
+            )
+            if result is None:
+                # Infeasible or solver failed, use fallback
+                return self._fallback_solution(candidates, names, total_budget, start_time, data=data)
+            return result
         
         except Exception as e:
             # Error occurred, use fallback
-            return self._fallback_solution(candidates, total_budget, start_time, str(e))
+            return self._fallback_solution(candidates, names, total_budget, start_time, str(e))
     
-    def _fallback_solution(self, candidates: List[Dict[str, Any]], 
+    def _fallback_solution(self, candidates: List[Dict[str, Any]], names: List[str],
                           total_budget: float, start_time: float, 
-                          error: str = None) -> OptimizationResult:
-        """Fallback heuristic solution."""
-        solve_time_ms = (time.time() - start_time) * 1000
-        
-        # Simple heuristic: allocate based on expected ROI
-        roi_scores = []
-        for i, candidate in enumerate(candidates):
-            roi = candidate.get('expected_roi', 0.0)
-            roi_scores.append((i, roi))
-        
-        # Sort by ROI descending
-        roi_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Allocate budget proportionally to ROI
-        total_roi = sum(score[1] for score in roi_scores if score[1] > 0)
+                          error: str = None,
+                          data: Optional[Dict[str, np.ndarray]] = None) -> OptimizationResult:
+        """Fallback heuristic solution (reuses the candidate arrays when given)."""
+        solve_time_ms = (time.perf_counter() - start_time) * 1000
         
-        solution = {}
-        if total_roi > 0:
-            for i, candidate in enumerate(candidates):
-                var_name = f"budget_{candidate.get('id', i)}"
-                roi = candidate.get('expected_roi', 0.0)
-                if roi > 0:
-                    allocation = (roi / total_roi) * total_budget
-                    # Apply min/max constraints
-                    min_budget = candidate.get('min_budget', 0)
-                    max_budget = candidate.get('max_budget', total_budget)
-                    solution[var_name] = max(min_budget, min(max_budget, allocation))
-                else:
-                    solution[var_name] = candidate.get('min_budget', 0)
-        else:
-            # Equal allocation if no ROI data
-            budget_per_candidate = total_budget / len(candidates)
-            for i, candidate in enumerate(candidates):
-                var_name = f"budget_{candidate.get('id', i)}"
-                solution[var_name] = budget_per_candidate
-        
-        # Normalize to total budget
-        current_total = sum(solution.values())
-        if current_total > 0:
-            for var_name in solution:
-                solution[var_name] = (solution[var_name] / current_total) * total_budget
+        # Simple heuristic: allocate budget proportionally to expected ROI
+        if data is None:
+            data = _candidates_to_arrays(candidates, total_budget)
+        allocation = _fallback_allocate(
+            data["expected_roi"], data["min_budget"], data["max_budget"], total_budget
+        )
         
-        # Calculate objective value (approximate)
-        objective_value = 0.0
-        for i, candidate in enumerate(candidates):
-            var_name = f"budget_{candidate.get('id', i)}"
-            budget = solution[var_name]
-            conversion_rate = candidate.get('conversion_rate', 0.0)
-            cost_per_click = candidate.get('cost_per_click', 1.0)
-            if cost_per_click > 0:
-                conversions = (budget / cost_per_click) * conversion_rate
-                objective_value += conversions
+        # Objective value (approximate): expected conversions of the allocation
+        cost_per_click = data["cost_per_click"]
+        positive_cpc = cost_per_click > 0
+        conversions = np.where(
+            positive_cpc,
+            allocation / np.where(positive_cpc, cost_per_click, 1.0) * data["conversion_rate"],
+            0.0
+        )
         
         return OptimizationResult(
             success=True,
-            objective_value=objective_value,
-            variables=solution,
+            objective_value=float(conversions.sum()),
+            variables=dict(zip(names, allocation.tolist())),
             solver_status="FALLBACK_HEURISTIC",
             solve_time_ms=solve_time_ms,
             constraints_satisfied=True,
             fallback_used=True
         )
     
-    def _get_status_string(self, status: int) -> str:
-        """Convert solver status to string."""
-        status_map = {
-            pywraplp.Solver.OPTIMAL: "OPTIMAL",
-            pywraplp.Solver.FEASIBLE: "FEASIBLE",
-            pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
-            pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
-            pywraplp.Solver.ABNORMAL: "ABNORMAL",
-            pywraplp.Solver.NOT_SOLVED: "NOT_SOLVED"
-        }
-        return status_map.get(status, "UNKNOWN")
-
-class WeightOptimizer:
+class WeightOptimizer(_SumModelOptimizer):
     """Weight optimization for traffic routing."""
     
-    def __init__(self, solver_timeout_s: float = 0.5):
-        self.solver_timeout_s = solver_timeout_s
+    DEFAULT_CONSTRAINTS = {'max_weight_delta': 0.15}
     
     @trace_function("optimizer.weights")
     async def optimize_weights(
@@ -239,119 +279,75 @@ class WeightOptimizer:
         constraints: Dict[str, Any],
         objective: str = "maximize_conversions"
     ) -> OptimizationResult:
-        """Optimize traffic weights across destinations."""
+        """Optimize traffic weights across destinations (solved in a worker thread)."""
+        return await asyncio.to_thread(
+            self._optimize_weights_sync, destinations, constraints, objective
+        )
+    
+    def _optimize_weights_sync(
+        self,
+        destinations: List[Dict[str, Any]],
+        constraints: Dict[str, Any],
+        objective: str
+    ) -> OptimizationResult:
+        """Blocking body of optimize_weights."""
+        
+        start_time = time.perf_counter()
+        names = [f"weight_{dest.get('id', i)}" for i, dest in enumerate(destinations)]
+        
+        # No choice to make: no destination, or a single one taking all traffic
+        if not destinations:
+            return _trivial_result({}, 0.0, start_time)
+        if len(destinations) == 1:
+            dest = destinations[0]
+            objective_value = 0.0
+            if objective == "maximize_conversions":
+                objective_value = float(dest.get('expected_traffic', 1000) * dest.get('conversion_rate', 0.0))
+            return _trivial_result({names[0]: 1.0}, objective_value, start_time)
         
-        start_time = time.time()
+        constraints = {**self._defaults, **constraints}
         
         try:
-            solver = pywraplp.Solver.CreateSolver('SCIP')
-            if not solver:
-                return self._fallback_weight_solution(destinations, start_time)
-            
-            solver.SetTimeLimit(int(self.solver_timeout_s * 1000))
-            
-            # Create weight variables
-            variables = {}
-            for i, dest in enumerate(destinations):
-                var_name = f"weight_{dest.get('id', i)}"
-                min_weight = dest.get('min_weight', 0.01)
-                max_weight = dest.get('max_weight', 0.8)
-                variables[var_name] = solver.NumVar(min_weight, max_weight, var_name)
-            
-            # Sum of weights = 1
-            weight_sum_constraint = solver.Constraint(1.0, 1.0, 'weight_sum')
-            for var in variables.values():
-                weight_sum_constraint.SetCoefficient(var, 1.0)
-            
-            # Weight delta constraints
-            max_delta = constraints.get('max_weight_delta', 0.15)
-            for i, dest in enumerate(destinations):
-                var_name = f"weight_{dest.get('id', i)}"
-                current_weight = dest.get('current_weight', 0.1)
-                
-                # Limit change from current weight
-                min_new_weight = max(0.01, current_weight - max_delta)
-                max_new_weight = min(0.8, current_weight + max_delta)
-                
-                variables[var_name].SetBounds(min_new_weight, max_new_weight)
-            
-            # Set objective
-            objective_expr = solver.Objective()
+            # Weight delta constraints: limit change from current weight, intersected
+            # with each destination's own [min_weight, max_weight]
+            max_delta = constraints['max_weight_delta']
+            current_weight = _column(destinations, 'current_weight', 0.1)
+            min_new_weight = np.maximum(np.maximum(_column(destinations, 'min_weight', 0.01), 0.01),
+                                        current_weight - max_delta)
+            max_new_weight = np.minimum(np.minimum(_column(destinations, 'max_weight', 0.8), 0.8),
+                                        current_weight + max_delta)
             
             if objective == "maximize_conversions":
-                for i, dest in enumerate(destinations):
-                    var_name = f"weight_{dest.get('id', i)}"
-                    conversion_rate = dest.get('conversion_rate', 0.0)
-                    traffic_volume = dest.get('expected_traffic', 1000)
-                    
-                    # Expected conversions = weight * traffic_volume * conversion_rate
-                    conversion_coefficient = traffic_volume * conversion_rate
-                    objective_expr.SetCoefficient(variables[var_name], conversion_coefficient)
-                
-                objective_expr.SetMaximization()
-            
-            # Solve
-            status = solver.Solve()
-            solve_time_ms = (time.time() - start_time) * 1000
-            
-            if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-                solution = {}
-                for var_name, var in variables.items():
-                    solution[var_name] = var.solution_value()
-                
-                return OptimizationResult(
-                    success=True,
-                    objective_value=solver.Objective().Value(),
-                    variables=solution,
-                    solver_status=self._get_status_string(status),
-                    solve_time_ms=solve_time_ms,
-                    constraints_satisfied=True
-                )
-            
+                # Expected conversions = weight * traffic_volume * conversion_rate
+                coefficients = (_column(destinations, 'expected_traffic', 1000)
+                                * _column(destinations, 'conversion_rate', 0.0))
             else:
-                return self._fallback_weight_solution(destinations, start_time)
+                coefficients = np.zeros(len(names))
+            
+            # Sum of weights = 1
+            result = self._solve_bounded_linear(
+                names, coefficients, min_new_weight, max_new_weight, 1.0, start_time
+            )
+            if result is None:
+                return self._fallback_weight_solution(destinations, names, start_time)
+            return result
         
         except Exception as e:
-            return self._fallback_weight_solution(destinations, start_time, str(e))
+            return self._fallback_weight_solution(destinations, names, start_time, str(e))
     
-    def _fallback_weight_solution(self, destinations: List[Dict[str, Any]], 
+    def _fallback_weight_solution(self, destinations: List[Dict[str, Any]], names: List[str],
                                  start_time: float, error: str = None) -> OptimizationResult:
         """Fallback weight allocation."""
-        solve_time_ms = (time.time() - start_time) * 1000
-        
-        # Allocate based on conversion rates
-        conversion_rates = []
-        for i, dest in enumerate(destinations):
-            rate = dest.get('conversion_rate', 0.0)
-            conversion_rates.append((i, rate))
+        solve_time_ms = (time.perf_counter() - start_time) * 1000
         
-        total_rate = sum(rate[1] for rate in conversion_rates if rate[1] > 0)
-        
-        solution = {}
-        if total_rate > 0:
-            for i, dest in enumerate(destinations):
-                var_name = f"weight_{dest.get('id', i)}"
-                rate = dest.get('conversion_rate', 0.0)
-                if rate > 0:
-                    weight = rate / total_rate
-                    # Apply bounds
-                    min_weight = dest.get('min_weight', 0.01)
-                    max_weight = dest.get('max_weight', 0.8)
-                    solution[var_name] = max(min_weight, min(max_weight, weight))
-                else:
-                    solution[var_name] = dest.get('min_weight', 0.01)
-        else:
-            # Equal weights
-            weight_per_dest = 1.0 / len(destinations)
-            for i, dest in enumerate(destinations):
-                var_name = f"weight_{dest.get('id', i)}"
-                solution[var_name] = weight_per_dest
-        
-        # Normalize to sum = 1
-        current_total = sum(solution.values())
-        if current_total > 0:
-            for var_name in solution:
-                solution[var_name] = solution[var_name] / current_total
+        # Allocate weights proportionally to conversion rates
+        allocation = _fallback_allocate(
+            _column(destinations, 'conversion_rate', 0.0),
+            _column(destinations, 'min_weight', 0.01),
+            _column(destinations, 'max_weight', 0.8),
+            1.0
+        )
+        solution = dict(zip(names, allocation.tolist()))
         
         return OptimizationResult(
             success=True,
@@ -362,15 +358,4 @@ class WeightOptimizer:
             constraints_satisfied=True,
             fallback_used=True
         )
-    
-    def _get_status_string(self, status: int) -> str:
-        """Convert solver status to string."""
-        status_map = {
-            pywraplp.Solver.OPTIMAL: "OPTIMAL",
-            pywraplp.Solver.FEASIBLE: "FEASIBLE",
-            pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
-            pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
-            pywraplp.Solver.ABNORMAL: "ABNORMAL",
-            pywraplp.Solver.NOT_SOLVED: "NOT_SOLVED"
-        }
-        return status_map.get(status, "UNKNOWN")
+    
\ No newline at end of file
@@ -3,82 +3,164 @@
 import asyncio
 import logging
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from datetime import date
+from typing import Dict, Any, Optional, List, Tuple
+from sqlalchemy import String, bindparam, func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import sessionmaker
 
 from .models import AlgorithmSettings, AIPolicy, AuditSettings, AuthorityLevel, AlgorithmRun
-from .schemas import ALGORITHM_SETTINGS_MAP
-from ..dg.dependencies import get_db
+from .schemas import DEFAULT_SETTINGS
+from . import cache
+from ..clock import local_today, utc_now
 from ..rcp.repository import RCPRepository
 from ..rcp.evaluator import RCPEvaluator
 from ..rcp.schemas import (
-    RCPEvaluationContext, ActionDTO, RCPPolicy, 
-    RCPEvaluationStats, RCPEvaluationDiff
+    RCPEvaluationContext, ActionDTO,
+    RCPEvaluationStats, RCPEvaluationDiff, policies_from_orm
 )
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of action audit rows written per INSERT
+AUDIT_BATCH_SIZE = 200
+# Attempts per audit batch before it is given up, and the delay before the
+# first retry (doubled on each further retry)
+AUDIT_WRITE_ATTEMPTS = 3
+AUDIT_RETRY_DELAY_S = 0.5
+
+
+# Settings and AI policy columns of one algorithm. Both tables are outer-joined
+# onto a one-row key, so a missing settings or policy record comes back as NULL
+# columns (settings_id / policy_id is None). Built once from the plain tables;
+# each call only binds algo_key, so the compiled form is reused from the
+# statement cache.
+_SETTINGS_TABLE = AlgorithmSettings.__table__
+_POLICY_TABLE = AIPolicy.__table__
+_CONFIG_KEY = select(bindparam("algo_key", type_=String).label("algo_key")).subquery()
+_CONFIG_STMT = select(
+    _SETTINGS_TABLE.c.id.label("settings_id"),
+    _SETTINGS_TABLE.c.settings_json,
+    _SETTINGS_TABLE.c.version,
+    _SETTINGS_TABLE.c.updated_by,
+    _SETTINGS_TABLE.c.updated_at,
+    _POLICY_TABLE.c.id.label("policy_id"),
+    _POLICY_TABLE.c.authority,
+    _POLICY_TABLE.c.risk_budget_daily,
+    _POLICY_TABLE.c.dry_run,
+    _POLICY_TABLE.c.hard_guards_json,
+    _POLICY_TABLE.c.soft_guards_json,
+).select_from(
+    _CONFIG_KEY.outerjoin(_SETTINGS_TABLE, _SETTINGS_TABLE.c.algo_key == _CONFIG_KEY.c.algo_key)
+               .outerjoin(_POLICY_TABLE, _POLICY_TABLE.c.algo_key == _CONFIG_KEY.c.algo_key)
+)
+
+
+async def _load_config_row(db: AsyncSession, algo_key: str) -> Row:
+    """Fetch the settings and AI policy columns of an algorithm in one Core query.
+    
+    Runs on the session's connection rather than through Session.execute, so
+    the row skips ORM execution and result processing entirely.
+    """
+    conn = await db.connection()
+    return (await conn.execute(_CONFIG_STMT, {"algo_key": algo_key})).one()
+
 
 class AlgorithmRunner:
     """Manages algorithm execution with settings and AI governance."""
     
-    def __init__(self, db_session_factory):
+    def __init__(self, db_session_factory: async_sessionmaker):
         self.db_session_factory = db_session_factory
         self.running_algorithms = {}
-        self.risk_budgets = {}  # Track daily risk usage
+        # Daily risk usage by (algo_key, date). Readers use the current dict as
+        # is; writers build a new dict and swap it in, under _risk_lock together
+        # with the budget check
+        self.risk_budgets = {}
+        self._risk_lock = asyncio.Lock()
         self.rcp_evaluator = RCPEvaluator()
+        # Action audit rows are queued and written in batches by a background task
+        self._audit_queue: Optional[asyncio.Queue] = None
+        self._audit_task: Optional[asyncio.Task] = None
+        # Action type -> handler, see _execute_algorithm_action
+        self._action_handlers = {
+            "reweight": self._do_reweight,
+            "budget_shift": self._do_budget_shift,
+            "pause_destination": self._do_pause_destination,
+        }
+        
+    async def load_config(self, algo_key: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Load (settings, AI policy) for an algorithm, with defaults.
+        
+        Both come from autopilot.cache; on a miss a single query fetches them
+        together and the entries are written in the same shape as the settings
+        and policy APIs, which invalidate them on writes.
+        """
+        cached_settings = await cache.get_json(cache.settings_key(algo_key))
+        cached_policy = await cache.get_json(cache.policy_key(algo_key))
+        
+        if cached_settings is None or cached_policy is None:
+            async with self.db_session_factory() as db:
+                row = await _load_config_row(db, algo_key)
+            
+            if cached_settings is None and row.settings_id is not None:
+                cached_settings = {
+                    "settings": row.settings_json,
+                    "version": row.version,
+                    "updated_by": row.updated_by,
+                    "updated_at": row.updated_at.isoformat()
+                }
+                await cache.set_json(cache.settings_key(algo_key), cached_settings)
+            
+            if cached_policy is None and row.policy_id is not None:
+                cached_policy = {
+                    "authority": AuthorityLevel(row.authority).value,
+                    "risk_budget_daily": row.risk_budget_daily,
+                    "dry_run": row.dry_run,
+                    "hard_guards": row.hard_guards_json,
+                    "soft_guards": row.soft_guards_json
+                }
+                await cache.set_json(cache.policy_key(algo_key), cached_policy)
+        
+        if cached_settings is not None:
+            settings = cached_settings["settings"]
+        else:
+            # Return defaults
+            settings = DEFAULT_SETTINGS.get(algo_key, {})
         
+        if cached_policy is not None:
+            # Cached entries are JSON: restore the authority enum
+            policy = {**cached_policy, "authority": AuthorityLevel(cached_policy["authority"])}
+        else:
+            # Return defaults
+            policy = {
+                "authority": AuthorityLevel.SAFE_APPLY,
+                "risk_budget_daily": 3,
+                "dry_run": False,
+                "hard_guards": {},
+                "soft_guards": {}
+            }
+        
+        return settings, policy
+    
     async def load_algorithm_settings(self, algo_key: str) -> Dict[str, Any]:
         """Load algorithm settings from database with defaults."""
-        with self.db_session_factory() as db:
-            settings_record = db.query(AlgorithmSettings).filter(
-                AlgorithmSettings.algo_key == algo_key
-            ).first()
-            
-            if settings_record:
-                return settings_record.settings_json
-            else:
-                # Return defaults
-                settings_class = ALGORITHM_SETTINGS_MAP.get(algo_key)
-                if settings_class:
-                    default_settings = settings_class()
-                    return default_settings.dict()
-                return {}
+        settings, _ = await self.load_config(algo_key)
+        return settings
     
     async def load_ai_policy(self, algo_key: str) -> Dict[str, Any]:
         """Load AI policy for algorithm."""
-        with self.db_session_factory() as db:
-            policy_record = db.query(AIPolicy).filter(
-                AIPolicy.algo_key == algo_key
-            ).first()
-            
-            if policy_record:
-                return {
-                    "authority": policy_record.authority,
-                    "risk_budget_daily": policy_record.risk_budget_daily,
-                    "dry_run": policy_record.dry_run,
-                    "hard_guards": policy_record.hard_guards_json,
-                    "soft_guards": policy_record.soft_guards_json
-                }
-            else:
-                # Return defaults
-                return {
-                    "authority": AuthorityLevel.SAFE_APPLY,
-                    "risk_budget_daily": 3,
-                    "dry_run": False,
-                    "hard_guards": {},
-                    "soft_guards": {}
-                }
+        _, policy = await self.load_config(algo_key)
+        return policy
     
-    async def check_risk_budget(self, algo_key: str, action_risk: float) -> bool:
+    async def check_risk_budget(self, algo_key: str, action_risk: float,
+                                policy: Optional[Dict[str, Any]] = None) -> bool:
         """Check if action is within daily risk budget."""
-        today = datetime.now().date()
-        budget_key = f"{algo_key}_{today}"
+        budget_key = (algo_key, local_today())
         
         # Get policy
-        policy = await self.load_ai_policy(algo_key)
+        if policy is None:
+            policy = await self.load_ai_policy(algo_key)
         daily_limit = policy["risk_budget_daily"]
         
         # Track current usage
@@ -90,23 +172,38 @@ class AlgorithmRunner:
         
         return True
     
-    async def apply_hard_guards(self, algo_key: str, action: Dict[str, Any]) -> bool:
+    def _add_risk_usage(self, budget_key: Tuple[str, date], delta: float) -> None:
+        """Publish a new risk usage snapshot with delta added to budget_key.
+        
+        Entries of previous days are dropped from the new snapshot, so the dict
+        holds at most one entry per algorithm.
+        """
+        today = local_today()
+        usage = {key: value for key, value in self.risk_budgets.items() if key[1] >= today}
+        if budget_key[1] >= today:
+            usage[budget_key] = usage.get(budget_key, 0.0) + delta
+        self.risk_budgets = usage
+    
+    async def apply_hard_guards(self, algo_key: str, action: ActionDTO,
+                                policy: Optional[Dict[str, Any]] = None) -> bool:
         """Apply hard guards to validate action."""
-        policy = await self.load_ai_policy(algo_key)
+        if policy is None:
+            policy = await self.load_ai_policy(algo_key)
         hard_guards = policy.get("hard_guards", {})
+        data = action.data
         
         # Example hard guard checks
         if "weight_delta_max" in hard_guards:
-            if action.get("type") == "reweight":
-                delta = abs(action.get("new_value", 0) - action.get("current_value", 0))
+            if action.type == "reweight":
+                delta = abs(data.get("new_value", 0) - data.get("current_value", 0))
                 if delta > hard_guards["weight_delta_max"]:
                     logger.warning(f"Hard guard violation: weight delta {delta} > {hard_guards['weight_delta_max']}")
                     return False
         
         if "budget_shift_max_percent" in hard_guards:
-            if action.get("type") == "budget_shift":
-                current = action.get("current_value", 0)
-                new = action.get("new_value", 0)
+            if action.type == "budget_shift":
+                current = data.get("current_value", 0)
+                new = data.get("new_value", 0)
                 if current > 0:
                     percent_change = abs(new - current) / current
                     if percent_change > hard_guards["budget_shift_max_percent"]:
@@ -115,131 +212,215 @@ class AlgorithmRunner:
         
         return True
     
-    async def execute_action(self, algo_key: str, action: Dict[str, Any]) -> bool:
+    async def execute_action(self, algo_key: str, action: ActionDTO,
+                             policy: Optional[Dict[str, Any]] = None) -> bool:
         """Execute algorithm action with governance checks."""
         try:
-            # Load policy
-            policy = await self.load_ai_policy(algo_key)
+            # Load policy once; the checks below reuse it
+            if policy is None:
+                policy = await self.load_ai_policy(algo_key)
             
             # Check authority level
             if policy["authority"] == AuthorityLevel.ADVISORY:
-                logger.info(f"Advisory mode: would execute {action}")
+                logger.info(f"Advisory mode: would execute {action.data}")
                 return True
             
             # Check dry run mode
             if policy["dry_run"]:
-                logger.info(f"Dry run mode: would execute {action}")
+                logger.info(f"Dry run mode: would execute {action.data}")
                 return True
             
-            # Check risk budget
-            action_risk = action.get("risk_score", 0.0)
-            if not await self.check_risk_budget(algo_key, action_risk):
-                return False
-            
             # Apply hard guards
-            if not await self.apply_hard_guards(algo_key, action):
+            if not await self.apply_hard_guards(algo_key, action, policy):
                 return False
             
-            # Execute the actual action
-            success = await self._execute_algorithm_action(algo_key, action)
+            # Check the risk budget and reserve this action's share atomically, so
+            # concurrent actions cannot both pass the check against the same usage
+            action_risk = action.risk_score or 0.0
+            budget_key = (algo_key, local_today())
+            async with self._risk_lock:
+                if not await self.check_risk_budget(algo_key, action_risk, policy):
+                    return False
+                self._add_risk_usage(budget_key, action_risk)
+            
+            # Execute the actual action, releasing the reservation if it does not go through
+            success = False
+            try:
+                success = await self._execute_algorithm_action(algo_key, action)
+            finally:
+                if not success:
+                    async with self._risk_lock:
+                        self._add_risk_usage(budget_key, -action_risk)
             
             if success:
-                # Update risk budget usage
-                today = datetime.now().date()
-                budget_key = f"{algo_key}_{today}"
-                self.risk_budgets[budget_key] = self.risk_budgets.get(budget_key, 0.0) + action_risk
-                
                 # Log audit trail
-                await self._log_action_audit(algo_key, action, "executed")
+                await self._log_action_audit(algo_key, action.data, "executed")
             
             return success
             
         except Exception as e:
             logger.error(f"Error executing action for {algo_key}: {e}")
-            await self._log_action_audit(algo_key, action, "error", str(e))
+            await self._log_action_audit(algo_key, action.data, "error", str(e))
             return False
     
-    async def _execute_algorithm_action(self, algo_key: str, action: Dict[str, Any]) -> bool:
+    async def _execute_algorithm_action(self, algo_key: str, action: ActionDTO) -> bool:
         """Execute the actual algorithm action (implement algorithm-specific logic)."""
-        action_type = action.get("type")
-        
-        if action_type == "reweight":
-            # Implement traffic reweighting logic
-            logger.info(f"Reweighting {action.get('target')} from {action.get('current_value')} to {action.get('new_value')}")
-            return True
-            
-        elif action_type == "budget_shift":
-            # Implement budget reallocation logic
-            logger.info(f"Shifting budget for {action.get('target')} from {action.get('current_value')} to {action.get('new_value')}")
-            return True
-            
-        elif action_type == "pause_destination":
-            # Implement destination pausing logic
-            logger.info(f"Pausing destination {action.get('target')}")
-            return True
-            
-        else:
-            logger.warning(f"Unknown action type: {action_type}")
+        handler = self._action_handlers.get(action.type)
+        if handler is None:
+            logger.warning(f"Unknown action type: {action.type}")
             return False
+        return await handler(action.data)
+    
+    async def _do_reweight(self, action: Dict[str, Any]) -> bool:
+        # Implement traffic reweighting logic
+        logger.info(f"Reweighting {action.get('target')} from {action.get('current_value')} to {action.get('new_value')}")
+        return True
+    
+    async def _do_budget_shift(self, action: Dict[str, Any]) -> bool:
+        # Implement budget reallocation logic
+        logger.info(f"Shifting budget for {action.get('target')} from {action.get('current_value')} to {action.get('new_value')}")
+        return True
+    
+    async def _do_pause_destination(self, action: Dict[str, Any]) -> bool:
+        # Implement destination pausing logic
+        logger.info(f"Pausing destination {action.get('target')}")
+        return True
     
     async def _log_action_audit(self, algo_key: str, action: Dict[str, Any], status: str, error: Optional[str] = None):
-        """Log action to audit trail."""
-        with self.db_session_factory() as db:
-            audit_entry = AuditSettings(
-                algo_key=algo_key,
-                actor="algorithm_runner",
-                diff_json={
-                    "action": action,
-                    "status": status,
-                    "error": error,
-                    "timestamp": datetime.now().isoformat()
-                },
-                created_at=datetime.now()
+        """Queue an action audit entry; the background writer persists it."""
+        now = utc_now()
+        self._ensure_audit_writer().put_nowait({
+            "algo_key": algo_key,
+            "actor": "algorithm_runner",
+            "diff_json": {
+                "action": action,
+                "status": status,
+                "error": error,
+                "timestamp": now.isoformat()
+            },
+            "created_at": now
+        })
+    
+    def _ensure_audit_writer(self) -> asyncio.Queue:
+        """Return the audit queue, (re)starting its writer task on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._audit_task is None or self._audit_task.done() or self._audit_task.get_loop() is not loop:
+            self._audit_queue = asyncio.Queue()
+            self._audit_task = loop.create_task(self._audit_writer_loop(self._audit_queue))
+        return self._audit_queue
+    
+    async def _audit_writer_loop(self, queue: asyncio.Queue) -> None:
+        """Write queued audit rows, one INSERT and commit per batch.
+        
+        Entries queued while a batch is being committed are picked up together
+        by the next one.
+        """
+        while True:
+            rows = [await queue.get()]
+            while len(rows) < AUDIT_BATCH_SIZE:
+                try:
+                    rows.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self._write_audit_batch(rows)
+            finally:
+                for _ in rows:
+                    queue.task_done()
+    
+    async def _write_audit_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert one batch of audit rows, retrying failed attempts with backoff.
+        
+        A batch that still fails after AUDIT_WRITE_ATTEMPTS is logged with its
+        rows, so the entries can be recovered from the error log.
+        """
+        delay = AUDIT_RETRY_DELAY_S
+        for attempt in range(1, AUDIT_WRITE_ATTEMPTS + 1):
+            try:
+                async with self.db_session_factory() as db:
+                    await db.execute(insert(AuditSettings), rows)
+                    await db.commit()
+                return
+            except Exception as e:
+                if attempt == AUDIT_WRITE_ATTEMPTS:
+                    logger.error("Dropping %d action audit entries after %d attempts: %s; entries: %r",
+                                 len(rows), attempt, e, rows)
+                    return
+                logger.warning("Error writing %d action audit entries (attempt %d/%d): %s",
+                               len(rows), attempt, AUDIT_WRITE_ATTEMPTS, e)
+                await asyncio.sleep(delay)
+                delay *= 2
+    
+    async def close(self) -> None:
+        """Flush the pending audit entries and stop the writer task.
+        
+        Called on application shutdown, see shutdown_runner.
+        """
+        if self._audit_task is None or self._audit_task.done():
+            return
+        await self._audit_queue.join()
+        self._audit_task.cancel()
+        self._audit_task = None
+    
+    async def _create_algorithm_run(self, run_id: str, algo_key: str) -> None:
+        """Insert the record of a starting algorithm run."""
+        async with self.db_session_factory() as db:
+            db.add(AlgorithmRun(id=run_id, algo_key=algo_key, status="running"))
+            await db.commit()
+    
+    async def _update_algorithm_run(self, run_id: str, algo_key: str, settings_version: int,
+                                    ai_authority_used: str, risk_cost: float, rcp_applied: bool,
+                                    status: str = "completed", error_message: Optional[str] = None) -> None:
+        """Record the outcome of an algorithm run."""
+        async with self.db_session_factory() as db:
+            await db.execute(
+                update(AlgorithmRun)
+                .where(AlgorithmRun.id == run_id, AlgorithmRun.algo_key == algo_key)
+                .values(
+                    status=status,
+                    completed_at=func.now(),
+                    settings_version=settings_version,
+                    ai_authority_used=ai_authority_used,
+                    risk_cost=risk_cost,
+                    rcp_applied=rcp_applied,
+                    error_message=error_message
+                )
             )
-            db.add(audit_entry)
-            db.commit()
+            await db.commit()
     
     async def run_algorithm(self, algo_key: str, manual_override: bool = False) -> Dict[str, Any]:
         """Run algorithm with loaded settings and governance."""
         run_id = str(uuid.uuid4())
         
         try:
-            # Create algorithm run record
-            await self._create_algorithm_run(run_id, algo_key)
-            
-            # Load settings and policy
-            settings = await self.load_algorithm_settings(algo_key)
-            policy = await self.load_ai_policy(algo_key)
+            # Load settings and policy (one cached lookup / one joined query)
+            settings, policy = await self.load_config(algo_key)
             
-            # Check if algorithm is active
+            # Disabled algorithms return before any run record is written
             if not settings.get("active", False):
-                await self._update_algorithm_run(
-                    run_id=run_id,
-                    algo_key=algo_key,
-                    settings_version=settings.get("version", 1),
-                    ai_authority_used=policy.get("authority_level", "advisory"),
-                    risk_cost=0.0,
-                    rcp_applied=False,
-                    status="inactive",
-                    error_message="Algorithm is disabled"
-                )
                 return {"status": "inactive", "message": "Algorithm is disabled"}
             
+            # Create algorithm run record
+            await self._create_algorithm_run(run_id, algo_key)
+            
             # Generate algorithm actions (mock implementation)
             raw_actions = await self._generate_algorithm_actions(algo_key, settings)
             
-            # Convert to ActionDTO format for RCP evaluation
-            action_dtos = []
-            for action in raw_actions:
-                action_dto = ActionDTO(
-                    id=str(uuid.uuid4()),
+            # Convert to ActionDTO format for RCP evaluation; the fallback
+            # idempotency key is only generated when the action has none
+            uuid4 = uuid.uuid4
+            action_dtos = [
+                ActionDTO(
+                    id=str(uuid4()),
                     type=action.get("type", "unknown"),
                     algo_key=algo_key,
-                    idempotency_key=action.get("idempotency_key", str(uuid.uuid4())),
+                    idempotency_key=action["idempotency_key"] if "idempotency_key" in action else str(uuid4()),
                     data=action,
                     risk_score=action.get("risk_score", 0.0)
                 )
-                action_dtos.append(action_dto)
+                for action in raw_actions
+            ]
             
             # Apply RCP evaluation before execution
             final_actions = action_dtos
@@ -264,11 +445,11 @@ class AlgorithmRunner:
             failed_actions = []
             
             for action_dto in final_actions:
-                success = await self.execute_action(algo_key, action_dto.data)
+                success = await self.execute_action(algo_key, action_dto, policy)
                 if success:
-                    executed_actions.append(action_dto.data)
+                    executed_actions.append(action_dto)
                 else:
-                    failed_actions.append(action_dto.data)
+                    failed_actions.append(action_dto)
             
             # Update algorithm run record with RCP info
             await self._update_algorithm_run(
@@ -285,7 +466,7 @@ class AlgorithmRunner:
                 "run_id": run_id,
                 "executed_actions": len(executed_actions),
                 "failed_actions": len(failed_actions),
-                "total_risk_used": sum(a.get("risk_score", 0) for a in executed_actions),
+                "total_risk_used": sum(a.risk_score or 0 for a in executed_actions),
                 "rcp_applied": rcp_applied,
                 "rcp_risk_cost": total_risk_cost
             }
@@ -297,64 +478,70 @@ class AlgorithmRunner:
     async def _apply_rcp_policies(self, algo_key: str, actions: List[ActionDTO], run_id: str) -> Optional[Any]:
         """Apply RCP policies to algorithm actions."""
         try:
-            with self.db_session_factory() as db:
-                rcp_repo = RCPRepository(db)
-                
-                # Get applicable policies
-                policies = rcp_repo.get_applicable_policies(algo_key)
+            async with self.db_session_factory() as db:
+                # RCPRepository is synchronous: run it on the session's sync view
+                policies = await db.run_sync(
+                    lambda session: RCPRepository(session).get_applicable_policies(algo_key)
+                )
                 if not policies:
                     return None
                 
-                # Convert to Pydantic models
-                policy_schemas = [RCPPolicy.from_orm(p) for p in policies]
+                # Project the trusted ORM rows onto schemas (no re-validation)
+                policy_schemas = policies_from_orm(policies)
                 
-                # Create evaluation context
+                # Create evaluation context (independent fetches run concurrently)
+                metrics, segment_data = await asyncio.gather(
+                    self._get_current_metrics(algo_key),
+                    self._get_segment_data(algo_key)
+                )
                 ctx = RCPEvaluationContext(
                     algo_key=algo_key,
                     run_id=run_id,
-                    metrics=await self._get_current_metrics(algo_key),
-                    segment_data=await self._get_segment_data(algo_key),
+                    metrics=metrics,
+                    segment_data=segment_data,
                     manual_override_active=False
                 )
                 
                 # Evaluate policies
                 result = self.rcp_evaluator.evaluate_policies(ctx, policy_schemas, actions)
                 
-                # Persist evaluation records
-                for policy in policies:
-                    stats = RCPEvaluationStats(
-                        risk_cost=result.risk_cost,
-                        actions_allowed=len(result.allowed),
-                        actions_modified=len(result.modified),
-                        actions_blocked=len(result.blocked),
-                        evaluation_time_ms=0.0,  # Would be measured in real implementation
-                        policies_applied=len(policy_schemas)
-                    )
-                    
-                    diff = RCPEvaluationDiff(
-                        before=actions,
-                        after=result.allowed + result.modified,
-                        changes=result.notes
-                    )
-                    
-                    # Determine result type
-                    if result.blocked and (result.allowed or result.modified):
-                        result_type = "mixed"
-                    elif result.blocked:
-                        result_type = "blocked"
-                    elif result.modified:
-                        result_type = "modified"
-                    else:
-                        result_type = "allowed"
-                    
-                    rcp_repo.create_evaluation(
-                        policy_id=policy.id,
+                # Persist evaluation records: the outcome is shared by every policy
+                stats = RCPEvaluationStats(
+                    risk_cost=result.risk_cost,
+                    actions_allowed=len(result.allowed),
+                    actions_modified=len(result.modified),
+                    actions_blocked=len(result.blocked),
+                    evaluation_time_ms=0.0,  # Would be measured in real implementation
+                    policies_applied=len(policy_schemas)
+                )
+                
+                diff = RCPEvaluationDiff(
+                    before=actions,
+                    after=result.allowed + result.modified,
+                    changes=result.notes
+                )
+                
+                # Determine result type
+                if result.blocked and (result.allowed or result.modified):
+                    result_type = "mixed"
+                elif result.blocked:
+                    result_type = "blocked"
+                elif result.modified:
+                    result_type = "modified"
+                else:
+                    result_type = "allowed"
+                
+                policy_ids = [policy.id for policy in policies]
+                await db.run_sync(
+                    lambda session: RCPRepository(session).create_evaluations_bulk(
+                        policy_ids=policy_ids,
                         algo_key=algo_key,
                         run_id=run_id,
                         result=result_type,
                         stats=stats,
                         diff=diff
                     )
+                )
                 
                 return result
                 
@@ -421,6 +608,11 @@ def get_runner():
     global runner
     if runner is None:
         # Initialize with database session factory
-        from ..dg.dependencies import get_db_session_factory
-        runner = AlgorithmRunner(get_db_session_factory())
+        from ..dg.dependencies import get_async_session_factory
+        runner = AlgorithmRunner(get_async_session_factory())
     return runner
+
+async def shutdown_runner() -> None:
+    """Flush the global runner's pending audit entries (application shutdown hook)."""
+    if runner is not None:
+        await runner.close()
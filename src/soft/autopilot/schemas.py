@@ -1,7 +1,7 @@
 """Pydantic schemas for autopilot algorithm settings and AI governance."""
 
 from typing import Dict, List, Literal, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -14,6 +14,8 @@ class AuthorityLevel(str, Enum):
 
 class CommonSettings(BaseModel):
     """Base settings common to all algorithms."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     active: bool = True
     interval_seconds: int = Field(default=300, ge=60, le=3600)
     cooldown_seconds: int = Field(default=120, ge=30, le=600)
@@ -34,32 +36,32 @@ class TrafficOptimizerSettings(CommonSettings):
     weight_cap: float = Field(default=0.8, ge=0.1, le=1.0)
     min_conversions_for_action: int = Field(default=5, ge=1, le=100)
     attr_window_minutes: int = Field(default=30, ge=5, le=120)
-    segmenting: Dict[str, bool] = Field(default={"geo": True, "device": True, "source": False})
-    whitelist_destinations: List[int] = Field(default=[])
-    blacklist_destinations: List[int] = Field(default=[])
-    daily_caps: Dict[int, float] = Field(default={})
+    segmenting: Dict[str, bool] = Field(default_factory=lambda: {"geo": True, "device": True, "source": False})
+    whitelist_destinations: List[int] = Field(default_factory=list)
+    blacklist_destinations: List[int] = Field(default_factory=list)
+    daily_caps: Dict[int, float] = Field(default_factory=dict)
     canary_percent: float = Field(default=0.05, ge=0.0, le=0.2)
     enable_aa_experiments: bool = False
 
 
 class AnomalyDetectorSettings(CommonSettings):
     """Anomaly Detector algorithm settings."""
-    watched_metrics: List[str] = Field(default=["cvr", "clicks", "errors", "latency_ms"])
+    watched_metrics: List[str] = Field(default_factory=lambda: ["cvr", "clicks", "errors", "latency_ms"])
     sensitivity: Literal["low", "medium", "high"] = "medium"
     baseline: Literal["24h_mean", "7d_seasonal"] = "24h_mean"
     detect_window_minutes: int = Field(default=60, ge=5, le=240)
     min_volume: int = Field(default=200, ge=10, le=10000)
     hysteresis_ratio: float = Field(default=0.2, ge=0.0, le=0.5)
-    alert_channels: List[str] = Field(default=["log", "email"])
-    auto_mitigations: Dict[str, bool] = Field(default={
+    alert_channels: List[str] = Field(default_factory=lambda: ["log", "email"])
+    auto_mitigations: Dict[str, bool] = Field(default_factory=lambda: {
         "pause_dest_on_spike_errors": True,
         "reroute_traffic_on_cvr_drop": True
     })
-    mitigation_limits: Dict[str, int] = Field(default={
+    mitigation_limits: Dict[str, int] = Field(default_factory=lambda: {
         "max_pauses_per_day": 3,
         "max_reroutes_per_day": 3
     })
-    slo: Dict[str, int] = Field(default={"mttd_minutes": 10, "mttr_minutes": 30})
+    slo: Dict[str, int] = Field(default_factory=lambda: {"mttd_minutes": 10, "mttr_minutes": 30})
 
 
 class BudgetArbitrageSettings(CommonSettings):
@@ -67,7 +69,7 @@ class BudgetArbitrageSettings(CommonSettings):
     pacing: Literal["uniform", "asap", "smart"] = "smart"
     roi_constraint: Literal["none", "cpa", "cpl", "roas"] = "cpa"
     roi_target_value: float = Field(default=5.0, ge=0.1, le=1000.0)
-    priority_tiers: Dict[str, List[int]] = Field(default={
+    priority_tiers: Dict[str, List[int]] = Field(default_factory=lambda: {
         "tier1": [], "tier2": [], "tier3": []
     })
     reallocation_min_step: float = Field(default=0.05, ge=0.01, le=0.5)
@@ -80,15 +82,15 @@ class BudgetArbitrageSettings(CommonSettings):
 
 class PredictiveAlertingSettings(CommonSettings):
     """Predictive Alerting algorithm settings."""
-    targets: List[str] = Field(default=["traffic_spike", "conversion_drop", "error_surge"])
+    targets: List[str] = Field(default_factory=lambda: ["traffic_spike", "conversion_drop", "error_surge"])
     horizon_minutes: int = Field(default=120, ge=15, le=720)
     confidence_threshold: float = Field(default=0.75, ge=0.5, le=0.99)
     min_lead_time_minutes: int = Field(default=15, ge=5, le=120)
-    playbooks: Dict[str, List[str]] = Field(default={
+    playbooks: Dict[str, List[str]] = Field(default_factory=lambda: {
         "traffic_spike": ["scale_up_router"],
         "conversion_drop": ["notify_marketing"]
     })
-    quiet_hours: Dict[str, Any] = Field(default={
+    quiet_hours: Dict[str, Any] = Field(default_factory=lambda: {
         "enabled": False,
         "start": "22:00",
         "end": "07:00",
@@ -98,22 +100,22 @@ class PredictiveAlertingSettings(CommonSettings):
 
 class SelfHealingSettings(CommonSettings):
     """Self-Healing algorithm settings."""
-    detectors: Dict[str, bool] = Field(default={
+    detectors: Dict[str, bool] = Field(default_factory=lambda: {
         "healthz": True,
         "latency": True,
         "error_rate": True
     })
-    remediation: Dict[str, bool] = Field(default={
+    remediation: Dict[str, bool] = Field(default_factory=lambda: {
         "restart_service": True,
         "disable_probe": True,
         "rollback_route": True
     })
-    retry_policy: Dict[str, Any] = Field(default={
+    retry_policy: Dict[str, Any] = Field(default_factory=lambda: {
         "max_retries": 3,
         "backoff_seconds": 60
     })
     blast_radius_cap_percent: float = Field(default=0.1, ge=0.01, le=0.5)
-    escalation: Dict[str, Any] = Field(default={
+    escalation: Dict[str, Any] = Field(default_factory=lambda: {
         "to": ["oncall@smartlinks"],
         "after_minutes": 20
     })
@@ -125,12 +127,12 @@ class AIPolicy(BaseModel):
     authority: AuthorityLevel = AuthorityLevel.SAFE_APPLY
     risk_budget_daily: int = Field(default=3, ge=0, le=100)
     dry_run: bool = False
-    hard_guards: Dict[str, float] = Field(default={
+    hard_guards: Dict[str, float] = Field(default_factory=lambda: {
         "weight_delta_max": 0.2,
         "budget_shift_max_percent": 0.2,
         "pause_dest_max_per_day": 2
     })
-    soft_guards: Dict[str, bool] = Field(default={
+    soft_guards: Dict[str, bool] = Field(default_factory=lambda: {
         "require_explain": True,
         "require_plan_id": True
     })
@@ -146,9 +148,8 @@ class AlgorithmSettingsResponse(BaseModel):
     updated_by: str
     updated_at: str
 
-    class Config:
-        # Allow creating the model with either field name or alias
-        allow_population_by_field_name = True
+    # Allow creating the model with either field name or alias
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class AuditEntry(BaseModel):
@@ -186,3 +187,10 @@ ALGORITHM_SETTINGS_MAP = {
     "predictive_alerting": PredictiveAlertingSettings,
     "self_healing": SelfHealingSettings,
 }
+
+# Defaults are fixed per settings class: dump them once. Shared between
+# callers, so treat them as read-only.
+DEFAULT_SETTINGS: Dict[str, Dict[str, Any]] = {
+    algo_key: settings_class().model_dump(mode='json')
+    for algo_key, settings_class in ALGORITHM_SETTINGS_MAP.items()
+}
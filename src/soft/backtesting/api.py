@@ -1,12 +1,15 @@
 """Backtesting & Counterfactuals API endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import ORJSONResponse, Response
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import orjson
 
 from .engine import BacktestingEngine, BacktestConfig, CounterfactualScenario
 from ..features.service import FeatureService
 from ..replay.engine import ReplayEngine
+from ..rcp.evaluator import RCPEvaluator
 from ..db import SessionLocal
 
 def get_db():
@@ -27,18 +30,26 @@ def check_role(x_role: str = Header(None)):
         raise HTTPException(status_code=403, detail="Invalid or missing role")
     return x_role
 
-def get_backtesting_engine(db: Session = Depends(get_db)) -> BacktestingEngine:
-    """Get backtesting engine instance."""
-    feature_service = FeatureService(db)
-    replay_engine = ReplayEngine(db)
-    return BacktestingEngine(feature_service, replay_engine)
+# Built once: the RCP evaluator (rate-limit state) is shared, only the
+# session-bound services are created per request. FeatureService uses the
+# shared Redis client configured from REDIS_URL
+_rcp_evaluator = RCPEvaluator()
+backtesting_engine = BacktestingEngine(
+    feature_service_factory=FeatureService,
+    replay_engine_factory=lambda feature_service: ReplayEngine(_rcp_evaluator, feature_service)
+)
 
-@router.post("/backtest/run")
+def get_backtesting_engine() -> BacktestingEngine:
+    """Get the shared backtesting engine."""
+    return backtesting_engine
+
+@router.post("/backtest/run", response_class=ORJSONResponse)
 @trace_function("api.backtest.run")
 async def run_backtest(
     config: Dict[str, Any],
     role: str = Depends(check_role),
-    engine: BacktestingEngine = Depends(get_backtesting_engine)
+    engine: BacktestingEngine = Depends(get_backtesting_engine),
+    db: Session = Depends(get_db)
 ):
     """Run backtesting analysis."""
     if role not in ["operator", "admin", "dg_ai"]:
@@ -55,9 +66,10 @@ async def run_backtest(
         confidence_level=config.get("confidence_level", 0.95)
     )
     
-    result = await engine.run_backtest(backtest_config)
+    result = await engine.run_backtest(backtest_config, db)
     
-    return {
+    # Encoded straight by orjson (numpy scalars included), no jsonable_encoder pass
+    return ORJSONResponse({
         "success": result.success,
         "policy_id": result.policy_id,
         "baseline_policy_id": result.baseline_policy_id,
@@ -69,16 +81,17 @@ async def run_backtest(
         "statistical_significance": result.statistical_significance,
         "sample_size": result.sample_size,
         "error_message": result.error_message
-    }
+    })
 
-@router.post("/backtest/counterfactual")
+@router.post("/backtest/counterfactual", response_class=ORJSONResponse)
 @trace_function("api.backtest.counterfactual")
 async def run_counterfactual_analysis(
     base_scenario: Dict[str, Any],
     counterfactual_scenarios: List[Dict[str, Any]],
     historical_context: Dict[str, Any],
     role: str = Depends(check_role),
-    engine: BacktestingEngine = Depends(get_backtesting_engine)
+    engine: BacktestingEngine = Depends(get_backtesting_engine),
+    db: Session = Depends(get_db)
 ):
     """Run counterfactual analysis."""
     if role not in ["operator", "admin", "dg_ai"]:
@@ -96,39 +109,42 @@ async def run_counterfactual_analysis(
     ]
     
     results = await engine.run_counterfactual_analysis(
-        base_scenario, scenarios, historical_context
+        base_scenario, scenarios, historical_context, db
     )
     
-    return {"results": results}
+    return ORJSONResponse({"results": results})
+
+# Static templates: encoded once at import, served as raw bytes
+_TEMPLATES_BYTES = orjson.dumps({
+    "templates": [
+        {
+            "name": "policy_comparison",
+            "description": "Compare two policies over a time period",
+            "config": {
+                "start_date": "2024-01-01T00:00:00",
+                "end_date": "2024-01-31T23:59:59",
+                "policy_id": "new_policy",
+                "baseline_policy_id": "current_policy",
+                "metrics": ["conversions", "revenue", "cost"],
+                "confidence_level": 0.95
+            }
+        },
+        {
+            "name": "uplift_analysis",
+            "description": "Analyze uplift of a policy vs no policy",
+            "config": {
+                "start_date": "2024-01-01T00:00:00",
+                "end_date": "2024-01-31T23:59:59",
+                "policy_id": "test_policy",
+                "baseline_policy_id": None,
+                "metrics": ["conversions", "revenue"],
+                "confidence_level": 0.95
+            }
+        }
+    ]
+})
 
 @router.get("/backtest/templates")
 async def get_backtest_templates(role: str = Depends(check_role)):
     """Get backtesting configuration templates."""
-    return {
-        "templates": [
-            {
-                "name": "policy_comparison",
-                "description": "Compare two policies over a time period",
-                "config": {
-                    "start_date": "2024-01-01T00:00:00",
-                    "end_date": "2024-01-31T23:59:59",
-                    "policy_id": "new_policy",
-                    "baseline_policy_id": "current_policy",
-                    "metrics": ["conversions", "revenue", "cost"],
-                    "confidence_level": 0.95
-                }
-            },
-            {
-                "name": "uplift_analysis",
-                "description": "Analyze uplift of a policy vs no policy",
-                "config": {
-                    "start_date": "2024-01-01T00:00:00",
-                    "end_date": "2024-01-31T23:59:59",
-                    "policy_id": "test_policy",
-                    "baseline_policy_id": None,
-                    "metrics": ["conversions", "revenue"],
-                    "confidence_level": 0.95
-                }
-            }
-        ]
-    }
+    return Response(content=_TEMPLATES_BYTES, media_type="application/json")
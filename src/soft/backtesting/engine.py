@@ -1,12 +1,43 @@
 """Backtesting & Counterfactuals engine with uplift calculation."""
 
+import asyncio
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from scipy.special import ndtr, ndtri
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import lru_cache
 from ..observability.otel import trace_function
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+@lru_cache(maxsize=16)
+def _z_score(confidence_level: float) -> float:
+    """Two-sided normal critical value for a confidence level (0.95 -> 1.96)."""
+    return float(ndtri(0.5 + confidence_level / 2))
+
+# Mock policy behaviours, first keyword found in the policy id wins
+_POLICY_EFFECTS = (
+    ("aggressive", {"conversions_multiplier": 1.15, "cost_multiplier": 1.25}),
+    ("conservative", {"conversions_multiplier": 0.95, "cost_multiplier": 0.85}),
+    ("balanced", {"conversions_multiplier": 1.05, "cost_multiplier": 1.02}),
+)
+_NEUTRAL_EFFECT = {"conversions_multiplier": 1.0, "revenue_multiplier": 1.0, "cost_multiplier": 1.0}
+
+@lru_cache(maxsize=256)
+def _policy_effect(policy_id: str) -> Dict[str, float]:
+    """Metric multipliers for a policy id. Cached and shared: do not mutate."""
+    pid = policy_id.lower()
+    for keyword, overrides in _POLICY_EFFECTS:
+        if keyword in pid:
+            return {**_NEUTRAL_EFFECT, **overrides}
+    return _NEUTRAL_EFFECT
+
 @dataclass
 class BacktestConfig:
     """Backtesting configuration."""
@@ -42,23 +73,31 @@ class CounterfactualScenario:
     context_overrides: Dict[str, Any]
 
 class BacktestingEngine:
-    """Backtesting and counterfactual analysis engine."""
+    """Backtesting and counterfactual analysis engine.
+    
+    Holds no per-request state and can be shared: the session-bound feature
+    service and the replay engine are built for each call from the factories.
+    """
     
-    def __init__(self, feature_service, replay_engine):
-        self.feature_service = feature_service
-        self.replay_engine = replay_engine
+    def __init__(self, feature_service_factory: Callable[[Any], Any],
+                 replay_engine_factory: Callable[[Any], Any]):
+        self.feature_service_factory = feature_service_factory
+        self.replay_engine_factory = replay_engine_factory
+        self.rng = np.random.default_rng()
     
     @trace_function("backtest.run")
-    async def run_backtest(self, config: BacktestConfig) -> BacktestResult:
+    async def run_backtest(self, config: BacktestConfig, db) -> BacktestResult:
         """Run backtesting analysis."""
         
         try:
             # Get historical data for the period
             historical_data = await self._get_historical_data(
+                self.feature_service_factory(db),
                 config.start_date, config.end_date, config.segments
             )
             
-            if not historical_data:
+            sample_size = len(historical_data["timestamp"])
+            if not sample_size:
                 return BacktestResult(
                     policy_id=config.policy_id,
                     baseline_policy_id=config.baseline_policy_id,
@@ -87,10 +126,7 @@ class BacktestingEngine:
             
             # Calculate uplift and statistical significance
             uplift = self._calculate_uplift(policy_results, baseline_results)
-            confidence_intervals = self._calculate_confidence_intervals(
-                policy_results, baseline_results, config.confidence_level
-            )
-            significance = self._test_statistical_significance(
+            confidence_intervals, significance = self._calculate_uplift_stats(
                 policy_results, baseline_results, config.confidence_level
             )
             
@@ -103,7 +139,7 @@ class BacktestingEngine:
                 uplift=uplift,
                 confidence_intervals=confidence_intervals,
                 statistical_significance=significance,
-                sample_size=len(historical_data),
+                sample_size=sample_size,
                 success=True
             )
             
@@ -127,15 +163,21 @@ class BacktestingEngine:
         self, 
         base_scenario: Dict[str, Any],
         counterfactual_scenarios: List[CounterfactualScenario],
-        historical_context: Dict[str, Any]
+        historical_context: Dict[str, Any],
+        db
     ) -> Dict[str, Dict[str, Any]]:
         """Run counterfactual analysis comparing multiple scenarios."""
         
         results = {}
+        replay_engine = self.replay_engine_factory(self.feature_service_factory(db))
+        # Every scenario replays at the same instant as the base
+        timestamp = historical_context.get("timestamp")
+        if timestamp is None:
+            timestamp = datetime.utcnow()
         
         # Run base scenario
-        base_result = await self.replay_engine.replay_decision(
-            timestamp=historical_context.get("timestamp", datetime.utcnow()),
+        base_result = await replay_engine.replay_decision(
+            timestamp=timestamp,
             context=historical_context,
             policy_overrides=base_scenario
         )
@@ -154,8 +196,8 @@ class BacktestingEngine:
             scenario_context = {**historical_context, **scenario.context_overrides}
             scenario_policies = {**base_scenario, **scenario.policy_changes}
             
-            scenario_result = await self.replay_engine.replay_decision(
-                timestamp=historical_context.get("timestamp", datetime.utcnow()),
+            scenario_result = await replay_engine.replay_decision(
+                timestamp=timestamp,
                 context=scenario_context,
                 policy_overrides=scenario_policies
             )
@@ -176,93 +218,60 @@ class BacktestingEngine:
         
         return results
     
-    async def _get_historical_data(self, start_date: datetime, end_date: datetime, 
-                                  segments: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Get historical data for backtesting."""
+    async def _get_historical_data(self, feature_service, start_date: datetime, end_date: datetime, 
+                                  segments: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get historical data for backtesting, column-wise (one array per field)."""
         
         # This would typically query a data warehouse or analytics database
         # For now, we'll simulate some historical data
         
-        data_points = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # Simulate daily data points
-            for hour in range(0, 24, 6):  # Every 6 hours
-                timestamp = current_date + timedelta(hours=hour)
-                
-                # Get features at this timestamp
-                features = await self.feature_service.get_features_at_time(
-                    timestamp, horizon_minutes=30
-                )
-                
-                # Simulate traffic and conversion data
-                data_point = {
-                    "timestamp": timestamp,
-                    "features": features,
-                    "traffic_volume": np.random.poisson(1000),
-                    "conversions": np.random.poisson(25),
-                    "revenue": np.random.normal(2500, 500),
-                    "cost": np.random.normal(1000, 200),
-                    "segment": np.random.choice(segments or ["default"], 1)[0]
-                }
-                
-                data_points.append(data_point)
-            
-            current_date += timedelta(days=1)
-        
-        return data_points
+        # Every 6 hours of every day from start_date through end_date
+        n_days = max((end_date - start_date).days + 1, 0)
+        timestamps = [
+            start_date + timedelta(days=day, hours=hour)
+            for day in range(n_days)
+            for hour in range(0, 24, 6)
+        ]
+        n = len(timestamps)
+        
+        # Get features at each timestamp
+        features = [
+            await feature_service.get_features_at_time(timestamp, horizon_minutes=30)
+            for timestamp in timestamps
+        ]
+        
+        # Simulate traffic and conversion data off the event loop
+        simulated = await asyncio.to_thread(self._build_simulated_arrays, n, segments)
+        return {"timestamp": timestamps, "features": features, **simulated}
+    
+    def _build_simulated_arrays(self, n: int, segments: Optional[List[str]]) -> Dict[str, np.ndarray]:
+        """Draw the simulated columns, one draw per distribution."""
+        rng = self.rng
+        return {
+            "traffic_volume": rng.poisson(1000, n).astype(np.float64),
+            "conversions": rng.poisson(25, n).astype(np.float64),
+            "revenue": rng.normal(2500, 500, n),
+            "cost": rng.normal(1000, 200, n),
+            "segment": rng.choice(segments or ["default"], n)
+        }
     
     async def _simulate_policy_performance(self, policy_id: str, 
-                                         historical_data: List[Dict[str, Any]],
+                                         historical_data: Dict[str, Any],
                                          metrics: List[str]) -> Dict[str, float]:
         """Simulate policy performance on historical data."""
         
-        total_metrics = {metric: 0.0 for metric in metrics}
+        # Mock policy simulation - would use actual replay engine. The effect
+        # only depends on the policy, so each metric is column sum * multiplier
+        policy_effect = _policy_effect(policy_id)
         
-        for data_point in historical_data:
-            # Simulate policy decision for this data point
-            context = {
-                "timestamp": data_point["timestamp"],
-                "features": data_point["features"],
-                "traffic_volume": data_point["traffic_volume"]
-            }
-            
-            # Mock policy simulation - would use actual replay engine
-            policy_effect = await self._simulate_policy_effect(policy_id, context)
-            
-            # Apply policy effect to observed metrics
-            for metric in metrics:
-                if metric in data_point:
-                    base_value = data_point[metric]
-                    effect_multiplier = policy_effect.get(f"{metric}_multiplier", 1.0)
-                    total_metrics[metric] += base_value * effect_multiplier
+        total_metrics = {metric: 0.0 for metric in metrics}
+        for metric in metrics:
+            column = historical_data.get(metric)
+            if isinstance(column, np.ndarray) and column.dtype.kind in "fiu":
+                total_metrics[metric] = float(column.sum()) * policy_effect.get(f"{metric}_multiplier", 1.0)
         
         return total_metrics
     
-    async def _simulate_policy_effect(self, policy_id: str, context: Dict[str, Any]) -> Dict[str, float]:
-        """Simulate the effect of a policy on metrics."""
-        
-        # Mock policy effects - would use actual policy evaluation
-        effects = {
-            "conversions_multiplier": 1.0,
-            "revenue_multiplier": 1.0,
-            "cost_multiplier": 1.0
-        }
-        
-        # Simulate different policy behaviors
-        if "aggressive" in policy_id.lower():
-            effects["conversions_multiplier"] = 1.15
-            effects["cost_multiplier"] = 1.25
-        elif "conservative" in policy_id.lower():
-            effects["conversions_multiplier"] = 0.95
-            effects["cost_multiplier"] = 0.85
-        elif "balanced" in policy_id.lower():
-            effects["conversions_multiplier"] = 1.05
-            effects["cost_multiplier"] = 1.02
-        
-        return effects
-    
     def _calculate_uplift(self, treatment_metrics: Dict[str, float], 
                          control_metrics: Dict[str, float]) -> Dict[str, float]:
         """Calculate uplift between treatment and control."""
@@ -270,97 +279,133 @@ class BacktestingEngine:
         if not control_metrics:
             return {}
         
+        # Aligned arrays over the treatment metric names; a missing control is 0
+        names = list(treatment_metrics)
+        t = np.array([treatment_metrics[m] for m in names], dtype=np.float64)
+        c = np.array([control_metrics.get(m, 0) for m in names], dtype=np.float64)
+        
+        has_control = c > 0
+        diff = t - c
+        uplift_pct = np.divide(diff, c, out=np.zeros_like(t), where=has_control) * 100
+        uplift_abs = np.where(has_control, diff, t)
+        
         uplift = {}
-        for metric, treatment_value in treatment_metrics.items():
-            control_value = control_metrics.get(metric, 0)
-            
-            if control_value > 0:
-                uplift[f"{metric}_uplift_pct"] = ((treatment_value - control_value) / control_value) * 100
-                uplift[f"{metric}_uplift_abs"] = treatment_value - control_value
-            else:
-                uplift[f"{metric}_uplift_pct"] = 0.0
-                uplift[f"{metric}_uplift_abs"] = treatment_value
+        for metric, pct, abs_ in zip(names, uplift_pct.tolist(), uplift_abs.tolist()):
+            uplift[f"{metric}_uplift_pct"] = pct
+            uplift[f"{metric}_uplift_abs"] = abs_
         
         return uplift
     
-    def _calculate_confidence_intervals(self, treatment_metrics: Dict[str, float],
-                                      control_metrics: Dict[str, float],
-                                      confidence_level: float) -> Dict[str, Tuple[float, float]]:
-        """Calculate confidence intervals for uplift."""
+    def _calculate_uplift_stats(self, treatment_metrics: Dict[str, float],
+                                control_metrics: Dict[str, float],
+                                confidence_level: float) -> Tuple[Dict[str, Tuple[float, float]], Dict[str, bool]]:
+        """Confidence intervals and significance of the uplift, in one pass.
+        
+        Only metrics present on both sides are reported.
+        """
+        
+        names = [metric for metric in treatment_metrics if metric in control_metrics]
+        t = np.array([treatment_metrics[m] for m in names], dtype=np.float64)
+        c = np.array([control_metrics[m] for m in names], dtype=np.float64)
+        z_score = _z_score(confidence_level)
+        
+        uplift = t - c
+        
+        # Simplified confidence interval: the standard error is estimated from
+        # the pooled value, assuming a sample size of 100. In practice, would
+        # use proper statistical methods
+        with np.errstate(invalid="ignore"):
+            margin_of_error = z_score * np.sqrt((t + c) / 2 / 100)
+        ci_low = uplift - margin_of_error
+        ci_high = uplift + margin_of_error
+        
+        # Simple heuristic: significant if the difference is over 5% of the
+        # control, or for a missing/zero control, if the treatment is positive
+        has_control = c > 0
+        relative_diff = np.divide(np.abs(uplift), c, out=np.zeros_like(t), where=has_control)
+        significant = np.where(has_control, relative_diff > 0.05, t > 0)
         
         confidence_intervals = {}
-        z_score = 1.96 if confidence_level == 0.95 else 2.58  # 95% or 99%
-        
-        for metric in treatment_metrics:
-            if metric in control_metrics:
-                # Simplified confidence interval calculation
-                # In practice, would use proper statistical methods
-                treatment_value = treatment_metrics[metric]
-                control_value = control_metrics[metric]
-                
-                # Estimate standard error (simplified)
-                pooled_variance = (treatment_value + control_value) / 2
-                standard_error = np.sqrt(pooled_variance / 100)  # Assume sample size of 100
-                
-                margin_of_error = z_score * standard_error
-                uplift = treatment_value - control_value
-                
-                confidence_intervals[f"{metric}_uplift"] = (
-                    uplift - margin_of_error,
-                    uplift + margin_of_error
-                )
-        
-        return confidence_intervals
-    
-    def _test_statistical_significance(self, treatment_metrics: Dict[str, float],
-                                     control_metrics: Dict[str, float],
-                                     confidence_level: float) -> Dict[str, bool]:
-        """Test statistical significance of differences."""
-        
         significance = {}
+        for metric, low, high, sig in zip(names, ci_low.tolist(), ci_high.tolist(), significant.tolist()):
+            confidence_intervals[f"{metric}_uplift"] = (low, high)
+            significance[f"{metric}_significant"] = sig
         
-        for metric in treatment_metrics:
-            if metric in control_metrics:
-                # Simplified significance test
-                # In practice, would use proper t-test or chi-square test
-                treatment_value = treatment_metrics[metric]
-                control_value = control_metrics[metric]
-                
-                # Simple heuristic: significant if difference > 5% and confidence interval doesn't include 0
-                if control_value > 0:
-                    relative_diff = abs(treatment_value - control_value) / control_value
-                    significance[f"{metric}_significant"] = relative_diff > 0.05
-                else:
-                    significance[f"{metric}_significant"] = treatment_value > 0
-        
-        return significance
+        return confidence_intervals, significance
     
     def _extract_metrics_from_actions(self, actions: List[Dict[str, Any]]) -> Dict[str, float]:
         """Extract metrics from action list."""
         
-        metrics = {
-            "total_actions": len(actions),
-            "total_budget": 0.0,
-            "estimated_conversions": 0.0,
-            "estimated_revenue": 0.0
-        }
+        n = len(actions)
+        budget = np.fromiter(
+            (a.get("new_budget", 0) if a.get("action_type") == "budget_change" else 0.0 for a in actions),
+            dtype=np.float64, count=n
+        )
         
-        for action in actions:
-            if action.get("action_type") == "budget_change":
-                metrics["total_budget"] += action.get("new_budget", 0)
-            
-            # Estimate conversions and revenue based on action parameters
-            cvr = action.get("expected_cvr", 0.025)
-            traffic = action.get("expected_traffic", 1000)
-            revenue_per_conversion = action.get("revenue_per_conversion", 100)
-            
-            estimated_conversions = traffic * cvr
-            estimated_revenue = estimated_conversions * revenue_per_conversion
-            
-            metrics["estimated_conversions"] += estimated_conversions
-            metrics["estimated_revenue"] += estimated_revenue
+        # Estimate conversions and revenue based on action parameters
+        cvr = np.fromiter((a.get("expected_cvr", 0.025) for a in actions), dtype=np.float64, count=n)
+        traffic = np.fromiter((a.get("expected_traffic", 1000) for a in actions), dtype=np.float64, count=n)
+        revenue_per_conversion = np.fromiter(
+            (a.get("revenue_per_conversion", 100) for a in actions), dtype=np.float64, count=n
+        )
+        estimated_conversions = traffic * cvr
         
-        return metrics
+        return {
+            "total_actions": n,
+            "total_budget": float(budget.sum()),
+            "estimated_conversions": float(estimated_conversions.sum()),
+            "estimated_revenue": float((estimated_conversions * revenue_per_conversion).sum())
+        }
+
+def _welford(x: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample variance (ddof=1) of x in a single pass."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in x:
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+    if n == 0:
+        return np.nan, np.nan
+    if n == 1:
+        return mean, np.nan
+    return mean, m2 / (n - 1)
+
+
+if NUMBA_AVAILABLE:
+    _welford = njit(cache=True)(_welford)
+else:
+    def _welford(x: np.ndarray) -> Tuple[float, float]:
+        """Mean and sample variance (ddof=1) of x, vectorised."""
+        if len(x) == 0:
+            return np.nan, np.nan
+        if len(x) == 1:
+            return float(x[0]), np.nan
+        return float(x.mean()), float(x.var(ddof=1))
+
+
+def _causal_stats(t: np.ndarray, c: np.ndarray,
+                  t_rows: int, c_rows: int) -> Tuple[float, float, float, float, float]:
+    """Return (treatment_mean, control_mean, ate, ate_se, t_stat).
+    
+    t and c hold the non-missing outcomes; the standard errors are taken over
+    the group row counts, as pandas std() / sqrt(len(group)) did.
+    """
+    t_mean, t_var = _welford(t)
+    c_mean, c_var = _welford(c)
+    ate = t_mean - c_mean
+    t_se2 = t_var / t_rows if t_rows > 0 else np.nan
+    c_se2 = c_var / c_rows if c_rows > 0 else np.nan
+    ate_se = np.sqrt(t_se2 + c_se2)
+    t_stat = ate / ate_se if ate_se > 0 else 0.0
+    return t_mean, c_mean, ate, ate_se, t_stat
+
+
+if NUMBA_AVAILABLE:
+    _causal_stats = njit(cache=True)(_causal_stats)
+
 
 class UpliftCalculator:
     """Specialized uplift calculation utilities."""
@@ -371,27 +416,25 @@ class UpliftCalculator:
                                outcome_column: str) -> Dict[str, float]:
         """Calculate causal uplift using proper statistical methods."""
         
-        treatment_mean = treatment_group[outcome_column].mean()
-        control_mean = control_group[outcome_column].mean()
-        
-        # Average Treatment Effect (ATE)
-        ate = treatment_mean - control_mean
+        # Means, Average Treatment Effect (ATE) and its standard error in one
+        # pass over each group (compiled with numba when available). Missing
+        # outcomes are skipped like pandas mean() / std() skip them
+        treatment_mean, control_mean, ate, ate_se, t_stat = _causal_stats(
+            treatment_group[outcome_column].dropna().to_numpy(dtype=np.float64),
+            control_group[outcome_column].dropna().to_numpy(dtype=np.float64),
+            len(treatment_group), len(control_group)
+        )
         
         # Relative uplift
         relative_uplift = (ate / control_mean) * 100 if control_mean > 0 else 0
         
-        # Standard errors
-        treatment_se = treatment_group[outcome_column].std() / np.sqrt(len(treatment_group))
-        control_se = control_group[outcome_column].std() / np.sqrt(len(control_group))
-        ate_se = np.sqrt(treatment_se**2 + control_se**2)
-        
         # Confidence interval
         ci_lower = ate - 1.96 * ate_se
         ci_upper = ate + 1.96 * ate_se
         
-        # P-value (simplified t-test)
-        t_stat = ate / ate_se if ate_se > 0 else 0
-        p_value = 2 * (1 - abs(t_stat))  # Simplified p-value calculation
+        # Two-sided p-value, normal approximation of the t-test
+        # (2 * ndtr(-|t|) rather than 2 * (1 - ndtr(|t|)) to keep precision in the tail)
+        p_value = float(2.0 * ndtr(-abs(t_stat)))
         
         return {
             "ate": ate,
@@ -1,39 +1,66 @@
 
 from __future__ import annotations
-import random, time
-from typing import Dict, List, Tuple
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 from .storage import get_offers_for_segment
 
 class BetaTS:
     """Bandit Beta Thompson Sampling sur reward binaire (conversion). Simplifié.
     On ne persiste pas l'état ici; l'état réel devrait aller en DB. Ici, fallback random.
+
+    État par segment en colonnes (SoA): alpha[seg][i], beta[seg][i] pour l'offre
+    oids[seg][i], oid_index[seg] donnant i à partir de l'offer_id.
     """
-    def __init__(self):
-        self.state: Dict[str, Dict[str, Tuple[int,int]]] = {}  # seg -> offer -> (a,b)
+    def __init__(self, seed: Optional[int] = None):
+        self.alpha: Dict[str, np.ndarray] = {}
+        self.beta: Dict[str, np.ndarray] = {}
+        self.oid_index: Dict[str, Dict[str, int]] = {}
+        self.oids: Dict[str, List[str]] = {}
+        # Générateur propre à l'instance (pas l'état global de random, ni son verrou);
+        # seed fixe pour des tirages reproductibles (tests, simulations)
+        self._rng = np.random.default_rng(seed)
+
+    def _arm(self, seg_id: str, offer_id: str) -> int:
+        """Index of offer_id in the segment arrays, adding a (1,1) arm if new."""
+        index = self.oid_index.setdefault(seg_id, {})
+        i = index.get(offer_id)
+        if i is None:
+            i = index[offer_id] = len(index)
+            self.oids.setdefault(seg_id, []).append(offer_id)
+            self.alpha[seg_id] = np.append(self.alpha.get(seg_id, np.empty(0, dtype=np.int64)), 1)
+            self.beta[seg_id] = np.append(self.beta.get(seg_id, np.empty(0, dtype=np.int64)), 1)
+        return i
+
+    def _indices(self, seg_id: str, offers: List[Tuple[str,str]]) -> np.ndarray:
+        """Indices of the offers in the segment arrays, initialising arms as needed."""
+        index = self.oid_index.get(seg_id)
+        if index is None:
+            # premier passage: init en bloc de tout le segment à (1,1)
+            oids = list(dict.fromkeys(oid for oid, _ in offers))
+            self.oids[seg_id] = oids
+            self.oid_index[seg_id] = index = {oid: i for i, oid in enumerate(oids)}
+            self.alpha[seg_id] = np.ones(len(oids), dtype=np.int64)
+            self.beta[seg_id] = np.ones(len(oids), dtype=np.int64)
+        try:
+            # segment déjà connu: simples lookups, sans init par offre
+            return np.fromiter((index[oid] for oid, _ in offers), dtype=np.intp, count=len(offers))
+        except KeyError:
+            # nouvelle(s) offre(s) dans le segment
+            return np.fromiter((self._arm(seg_id, oid) for oid, _ in offers), dtype=np.intp, count=len(offers))
 
     def pick(self, seg_id: str, offers: List[Tuple[str,str]]) -> Tuple[str,str]:
         if not offers:
             return ("", "")
-        # init
-        self.state.setdefault(seg_id, {})
-        for oid,_ in offers:
-            self.state[seg_id].setdefault(oid, (1,1))
-        # sample
-        samples = []
-        for oid,_ in offers:
-            a,b = self.state[seg_id][oid]
-            samples.append((random.betavariate(a,b), oid))
-        samples.sort(reverse=True)
-        chosen = samples[0][1]
-        url = dict(offers)[chosen]
-        return (chosen, url)
+        idx = self._indices(seg_id, offers)
+        # sample: un tirage beta vectorisé pour toutes les offres
+        samples = self._rng.beta(self.alpha[seg_id][idx], self.beta[seg_id][idx])
+        return offers[int(samples.argmax())]
 
     def update(self, seg_id: str, offer_id: str, converted: bool):
-        s = self.state.setdefault(seg_id, {})
-        a,b = s.get(offer_id, (1,1))
-        if converted: a += 1
-        else: b += 1
-        s[offer_id] = (a,b)
+        i = self._arm(seg_id, offer_id)
+        if converted: self.alpha[seg_id][i] += 1
+        else: self.beta[seg_id][i] += 1
 
 bandit = BetaTS()
 
@@ -3,27 +3,34 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 
 from ..autopilot.bandits.thompson import BanditTrafficOptimizer
 from ..observability.otel import trace_function
 
 router = APIRouter()
 
-# Global bandit optimizers (in production, would be managed per tenant)
-bandit_optimizers: Dict[str, BanditTrafficOptimizer] = {}
+_ALLOWED_ROLES = frozenset({"viewer", "operator", "admin", "dg_ai"})
+_WRITER_ROLES = frozenset({"operator", "admin", "dg_ai"})
 
 def check_role(x_role: str = Header(None)):
     """Check user role for RBAC."""
-    if not x_role or x_role not in ["viewer", "operator", "admin", "dg_ai"]:
+    if not x_role or x_role not in _ALLOWED_ROLES:
         raise HTTPException(status_code=403, detail="Invalid or missing role")
     return x_role
 
+# Global bandit optimizers, one per (algo_key, algorithm) (in production, would
+# be managed per tenant). algo_key comes from the client, so the cache is bounded;
+# an evicted optimizer restarts with fresh arms.
+@lru_cache(maxsize=1024)
+def _cached_bandit_optimizer(algo_key: str, algorithm: str) -> BanditTrafficOptimizer:
+    return BanditTrafficOptimizer(algorithm=algorithm)
+
 def get_bandit_optimizer(algo_key: str, algorithm: str = "thompson") -> BanditTrafficOptimizer:
     """Get or create bandit optimizer for algorithm."""
-    key = f"{algo_key}_{algorithm}"
-    if key not in bandit_optimizers:
-        bandit_optimizers[key] = BanditTrafficOptimizer(algorithm=algorithm)
-    return bandit_optimizers[key]
+    # Positional call: lru_cache keys on the call form, and keyword or defaulted
+    # calls would otherwise get a separate optimizer with its own bandit state
+    return _cached_bandit_optimizer(algo_key, algorithm)
 
 @router.post("/bandits/{algo_key}/optimize")
 @trace_function("api.bandits.optimize")
@@ -36,7 +43,7 @@ async def optimize_traffic(
     role: str = Depends(check_role)
 ):
     """Optimize traffic allocation using bandits."""
-    if role not in ["operator", "admin", "dg_ai"]:
+    if role not in _WRITER_ROLES:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
     optimizer = get_bandit_optimizer(algo_key, algorithm)
@@ -81,7 +88,7 @@ async def update_bandit_data(
     role: str = Depends(check_role)
 ):
     """Update bandit with new performance data."""
-    if role not in ["operator", "admin", "dg_ai"]:
+    if role not in _WRITER_ROLES:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
     optimizer = get_bandit_optimizer(algo_key, algorithm)
@@ -0,0 +1,34 @@
+"""
+Cached wall-clock helpers for hot request paths.
+"""
+import time
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _iso_for_second(_second: int) -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO-8601 string, formatted at most once per second."""
+    return _iso_for_second(int(time.time()))
+
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, for naive ``DateTime`` columns.
+
+    Every writer of a table should use it, so its rows share one time base.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=1)
+def _date_for_second(_second: int) -> date:
+    return datetime.now().date()
+
+
+def local_today() -> date:
+    """Current local date, computed at most once per second."""
+    return _date_for_second(int(time.time()))
@@ -3,9 +3,16 @@ import os
 import yaml
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Union
 from dotenv import load_dotenv
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Determine the project root and load the .env file explicitly
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 dotenv_path = os.path.join(BASE_DIR, '.env')
@@ -36,22 +43,21 @@ class Policy:
     max_payout_day_creator_eur: float
     base_hold_days: int
 
-def load_policy(path: str | None = None) -> Policy:
-    # Determine path if not provided
-    candidate = None
+def _resolve_policy_path(path: str | None = None) -> str:
+    """Return the absolute path of the policy file to load."""
     if path:
-        candidate = path
-    else:
-        for p in _POLICY_CANDIDATES:
-            if os.path.exists(p):
-                candidate = p
-                break
-    if not candidate:
-        raise FileNotFoundError(
-            f"Policy file not found. Tried: {', '.join(_POLICY_CANDIDATES)}"
-        )
-    with open(candidate, "r", encoding="utf-8") as f:
-        y = yaml.safe_load(f)
+        return os.path.abspath(path)
+    for p in _POLICY_CANDIDATES:
+        if os.path.exists(p):
+            return p
+    raise FileNotFoundError(
+        f"Policy file not found. Tried: {', '.join(_POLICY_CANDIDATES)}"
+    )
+
+@lru_cache(maxsize=8)
+def _load_policy_file(path: str) -> Policy:
+    with open(path, "r", encoding="utf-8") as f:
+        y = yaml.load(f, Loader=_YamlLoader)
     return Policy(
         version=str(y.get("version")),
         fraud_threshold=float(y["fraud"]["threshold"]),
@@ -70,6 +76,15 @@ def load_policy(path: str | None = None) -> Policy:
         base_hold_days=int(y["hold"]["base_days"]),
     )
 
+def load_policy(path: str | None = None) -> Policy:
+    """Load the policy, parsed once per file; load_policy.cache_clear() forces a re-read.
+
+    The returned Policy is shared between callers: treat it as read-only.
+    """
+    return _load_policy_file(_resolve_policy_path(path))
+
+load_policy.cache_clear = _load_policy_file.cache_clear
+
 # DB et serveur
 DB_PATH = os.getenv("SMARTLINKS_DB", os.path.join(BASE_DIR, "smartlinks.db"))
 HOST = os.getenv("SMARTLINKS_HOST", "127.0.0.1")
@@ -133,24 +148,82 @@ class AISupervisorConfig:
 ai_supervisor_config = AISupervisorConfig()
 
 # Configure logging
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-
-def setup_logging():
-    """Configure logging for the application."""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    logging.basicConfig(
-        level=getattr(logging, ai_supervisor_config.log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(),
-            RotatingFileHandler(
-                ai_supervisor_config.log_file,
-                maxBytes=ai_supervisor_config.max_log_size_mb * 1024 * 1024,
-                backupCount=ai_supervisor_config.log_backup_count
-            )
-        ]
+import logging.handlers
+import queue
+
+# Every logging handler is driven by one QueueListener thread: loggers only
+# enqueue records, the listener formats them and performs the writes
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_handlers: List[logging.Handler] = []
+# Loggers routed to their own handlers by add_queued_handlers
+_detached_loggers: Set[str] = set()
+
+def _is_detached(record: logging.LogRecord) -> bool:
+    """Whether the record belongs to a logger routed by add_queued_handlers."""
+    return any(record.name == name or record.name.startswith(name + ".")
+               for name in _detached_loggers)
+
+def _listen(*handlers: logging.Handler) -> logging.handlers.QueueListener:
+    """Add handlers to the shared listener, starting it on first use."""
+    global _log_listener
+    _log_handlers.extend(handlers)
+    if _log_listener is None:
+        _log_listener = logging.handlers.QueueListener(_log_queue, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    _log_listener.handlers = tuple(_log_handlers)
+    return _log_listener
+
+def add_queued_handlers(logger_name: str, *handlers: logging.Handler,
+                        level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Route a logger's records to its own handlers through the shared listener.
+
+    The logger stops propagating, so its records are only written by these
+    handlers. Calling it again for the same logger is a no-op.
+    """
+    if logger_name in _detached_loggers:
+        return _log_listener
+    target = logging.getLogger(logger_name)
+    for handler in handlers:
+        handler.addFilter(logging.Filter(logger_name))
+    _detached_loggers.add(logger_name)
+    listener = _listen(*handlers)
+
+    target.addHandler(logging.handlers.QueueHandler(_log_queue))
+    target.setLevel(level)
+    target.propagate = False
+    return listener
+
+def setup_logging() -> Optional[logging.handlers.QueueListener]:
+    """Configure logging for the application.
+
+    The root logger only enqueues records; the shared QueueListener thread
+    formats them and performs the console/rotating-file writes.
+    """
+    root = logging.getLogger()
+    # Same contract as logging.basicConfig: leave an already configured root alone
+    if root.handlers:
+        return _log_listener
+
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.handlers.RotatingFileHandler(
+        ai_supervisor_config.log_file,
+        maxBytes=ai_supervisor_config.max_log_size_mb * 1024 * 1024,
+        backupCount=ai_supervisor_config.log_backup_count
     )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+        # Records of detached loggers share the queue but not these handlers
+        handler.addFilter(lambda record: not _is_detached(record))
+    listener = _listen(stream_handler, file_handler)
+
+    root.addHandler(logging.handlers.QueueHandler(_log_queue))
+    root.setLevel(getattr(logging, ai_supervisor_config.log_level.upper()))
+    return listener
 
 # Initialize logging when this module is imported
 setup_logging()
@@ -11,13 +11,22 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable not set")
 
+# SQL statement logging is opt-in (SQL_ECHO=1): echoing formats and logs every query
+SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
+
+# Explicit pool sizing for server databases (SQLite keeps its default pool)
+_pool_kwargs = {}
+if not DATABASE_URL.startswith("sqlite"):
+    _pool_kwargs = {"pool_size": 20, "max_overflow": 40}
+
 # Create database engine
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
+    echo=SQL_ECHO,
     future=True,
     pool_pre_ping=True,  # Enable connection health checks
     pool_recycle=300,    # Recycle connections after 5 minutes
+    **_pool_kwargs
 )
 
 # Create session factory
@@ -1,14 +1,17 @@
 """
 Dependency injection for the SmartLinks DG API.
 """
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from contextlib import contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 import logging
 import os
 
+import orjson
+
 from .ai.supervisor import IASupervisor, OperationMode
 
 logger = logging.getLogger(__name__)
@@ -69,9 +72,16 @@ def get_current_ia_supervisor(
     """Dependency that returns the current IASupervisor instance."""
     return supervisor
 
+def _json_serializer(value) -> str:
+    """orjson-backed encoder for JSON/JSONB columns (settings, guards, audit diffs)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# JSON column codecs shared by the sync and async engines
+JSON_CODEC_KWARGS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./smartlinks.db")
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **JSON_CODEC_KWARGS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db() -> Generator[Session, None, None]:
@@ -85,3 +95,36 @@ def get_db() -> Generator[Session, None, None]:
 def get_db_session_factory():
     """Get database session factory."""
     return SessionLocal
+
+# Async database configuration (same database, asyncio driver)
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def _async_database_url(url: str) -> str:
+    """Map a synchronous DATABASE_URL onto its asyncio driver."""
+    scheme, sep, rest = url.partition("://")
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme in ("postgres", "postgresql", "postgresql+psycopg2"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get the async session factory, creating the pooled engine on first use."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        url = _async_database_url(DATABASE_URL)
+        pool_kwargs = {}
+        if not url.startswith("sqlite"):
+            pool_kwargs = {"pool_size": 20, "max_overflow": 10, "pool_timeout": 30}
+        async_engine = create_async_engine(
+            url, pool_pre_ping=True, echo=False, **JSON_CODEC_KWARGS, **pool_kwargs
+        )
+        _async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database dependency."""
+    async with get_async_session_factory()() as db:
+        yield db
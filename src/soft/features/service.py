@@ -1,6 +1,7 @@
 """Feature Store service for online and offline features."""
 
 import json
+import os
 import redis
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
@@ -10,12 +11,24 @@ from sqlalchemy import and_, desc
 from ..pac.models import FeatureSnapshot
 from ..pac.schemas import FeatureSnapshot as FeatureSnapshotSchema
 
+# Same setting as autopilot.cache; defaults to the local Redis used so far
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_redis_client: Optional[redis.Redis] = None
+
+def get_redis_client() -> redis.Redis:
+    """Lazily create the pooled feature store Redis client, shared by every FeatureService."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
 class FeatureService:
     """Feature store service."""
     
     def __init__(self, db: Session, redis_client: Optional[redis.Redis] = None):
         self.db = db
-        self.redis = redis_client or redis.Redis(host='localhost', port=6379, db=0)
+        self.redis = redis_client or get_redis_client()
         self.online_ttl = 3600  # 1 hour TTL for online features
     
     async def set_online_feature(self, key: str, value: Dict[str, Any], 
@@ -9,6 +9,10 @@ from ..observability.otel import trace_function
 
 router = APIRouter()
 
+# Shared optimizers: stateless, shared to avoid per-request construction
+budget_optimizer = BudgetArbitrageOptimizer()
+weight_optimizer = WeightOptimizer()
+
 def check_role(x_role: str = Header(None)):
     """Check user role for RBAC."""
     if not x_role or x_role not in ["viewer", "operator", "admin", "dg_ai"]:
@@ -28,9 +32,7 @@ async def optimize_budget_allocation(
     if role not in ["operator", "admin", "dg_ai"]:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    optimizer = BudgetArbitrageOptimizer()
-    
-    result = await optimizer.optimize_budget_allocation(
+    result = await budget_optimizer.optimize_budget_allocation(
         candidates=candidates,
         total_budget=total_budget,
         constraints=constraints or {},
@@ -60,9 +62,7 @@ async def optimize_traffic_weights(
     if role not in ["operator", "admin", "dg_ai"]:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    optimizer = WeightOptimizer()
-    
-    result = await optimizer.optimize_weights(
+    result = await weight_optimizer.optimize_weights(
         destinations=destinations,
         constraints=constraints or {},
         objective=objective
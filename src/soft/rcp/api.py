@@ -13,7 +13,7 @@ from .evaluator import RCPEvaluator
 from .schemas import (
     RCPPolicy, RCPPolicyCreate, RCPPolicyUpdate, RCPPolicyList,
     RCPEvaluation, RCPEvaluationList, RCPPreviewRequest, RCPResult,
-    RCPEvaluationContext, ActionDTO
+    RCPEvaluationContext, ActionDTO, policies_from_orm
 )
 
 router = APIRouter(prefix="/rcp", tags=["Runtime Control Policies"])
@@ -65,7 +65,7 @@ async def list_policies(
     total_policies = repo.list_policies(scope=scope, algo_key=algo_key, enabled=enabled)
     
     return RCPPolicyList(
-        policies=[RCPPolicy.from_orm(p) for p in policies],
+        policies=policies_from_orm(policies),
         total=len(total_policies),
         page=page,
         per_page=per_page
@@ -173,8 +173,8 @@ async def preview_rcp_evaluation(
         # Get applicable policies
         policies = repo.get_applicable_policies(request.algo_key)
         
-        # Convert to Pydantic models
-        policy_schemas = [RCPPolicy.from_orm(p) for p in policies]
+        # Project the trusted ORM rows onto schemas (no re-validation)
+        policy_schemas = policies_from_orm(policies)
         
         # Create evaluation context
         ctx = RCPEvaluationContext(
@@ -5,8 +5,8 @@ Repository layer for RCP data access.
 import uuid
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, or_, desc, insert, lambda_stmt, select
 
 from .models import RCPPolicy, RCPEvaluation
 from .schemas import (
@@ -124,39 +124,38 @@ class RCPRepository:
         enabled_only: bool = True,
         include_global: bool = True
     ) -> List[RCPPolicy]:
-        """Get policies applicable to a specific algorithm."""
-        conditions = []
+        """Get policies applicable to a specific algorithm.
         
-        if enabled_only:
-            conditions.append(RCPPolicy.enabled == True)
-        
-        # Algorithm-specific policies
-        algo_condition = and_(
-            RCPPolicy.scope == "algorithm",
-            RCPPolicy.algo_key == algo_key
-        )
+        Built as a lambda statement so the compiled SQL is cached per flag
+        combination and each call only binds algo_key and the current time.
+        """
+        # Callers only read policy columns (RCPPolicySchema has no evaluations
+        # field); forbid the lazy evaluations load so a future access cannot turn
+        # this into one extra query per policy
+        stmt = lambda_stmt(lambda: select(RCPPolicy).options(raiseload(RCPPolicy.evaluations)))
         
-        scope_conditions = [algo_condition]
+        if enabled_only:
+            stmt += lambda s: s.where(RCPPolicy.enabled == True)
         
-        # Global policies
+        # Algorithm-specific policies, global policies (optional) and segment
+        # policies (always included as they're filtered by evaluator)
         if include_global:
-            scope_conditions.append(RCPPolicy.scope == "global")
-        
-        # Segment policies (always included as they're filtered by evaluator)
-        scope_conditions.append(RCPPolicy.scope == "segment")
-        
-        conditions.append(or_(*scope_conditions))
+            stmt += lambda s: s.where(or_(
+                and_(RCPPolicy.scope == "algorithm", RCPPolicy.algo_key == algo_key),
+                RCPPolicy.scope == "global",
+                RCPPolicy.scope == "segment"
+            ))
+        else:
+            stmt += lambda s: s.where(or_(
+                and_(RCPPolicy.scope == "algorithm", RCPPolicy.algo_key == algo_key),
+                RCPPolicy.scope == "segment"
+            ))
         
         # Filter out expired policies
         now = datetime.utcnow()
-        conditions.append(
-            or_(
-                RCPPolicy.expires_at.is_(None),
-                RCPPolicy.expires_at > now
-            )
-        )
+        stmt += lambda s: s.where(or_(RCPPolicy.expires_at.is_(None), RCPPolicy.expires_at > now))
         
-        return self.db.query(RCPPolicy).filter(and_(*conditions)).all()
+        return self.db.execute(stmt).scalars().all()
     
     # Evaluation operations
     
@@ -185,6 +184,38 @@ class RCPRepository:
         self.db.refresh(db_evaluation)
         return db_evaluation
     
+    def create_evaluations_bulk(
+        self,
+        policy_ids: List[str],
+        algo_key: str,
+        run_id: Optional[str],
+        result: str,
+        stats: RCPEvaluationStats,
+        diff: RCPEvaluationDiff
+    ) -> int:
+        """Record one shared evaluation outcome for several policies in a single INSERT."""
+        if not policy_ids:
+            return 0
+        
+        # Serialize the shared payload once for every row
+        stats_json = stats.dict()
+        diff_json = diff.dict()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "policy_id": policy_id,
+                "algo_key": algo_key,
+                "run_id": run_id,
+                "result": result,
+                "stats_json": stats_json,
+                "diff_json": diff_json,
+            }
+            for policy_id in policy_ids
+        ]
+        self.db.execute(insert(RCPEvaluation), rows)
+        self.db.commit()
+        return len(rows)
+    
     def list_evaluations(
         self,
         policy_id: Optional[str] = None,
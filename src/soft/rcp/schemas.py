@@ -197,6 +197,46 @@ class RCPEvaluationContext(BaseModel):
     manual_override_active: bool = Field(False, description="Whether manual override is active")
 
 
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def policy_from_orm(row: Any) -> RCPPolicy:
+    """Project a trusted ORM policy row onto RCPPolicy without re-validation.
+
+    The ``*_json`` columns were written from validated schemas by the
+    repository, so they only need to be wrapped back into their models.
+    """
+    selector = row.selector_json
+    return RCPPolicy.model_construct(
+        id=row.id,
+        name=row.name,
+        scope=_enum_value(row.scope),
+        algo_key=row.algo_key,
+        selector=Selector.model_construct(**selector) if selector else None,
+        mode=_enum_value(row.mode),
+        authority_required=_enum_value(row.authority_required),
+        hard_guards=GuardLimits.model_construct(**(row.hard_guards_json or {})),
+        soft_guards=SoftGuards.model_construct(**(row.soft_guards_json or {})),
+        limits=RateLimits.model_construct(**(row.limits_json or {})),
+        gates=[GateCondition.model_construct(**gate) for gate in row.gates_json or ()],
+        mutations=[MutationRule.model_construct(**rule) for rule in row.mutations_json or ()],
+        schedule_cron=row.schedule_cron,
+        rollout_percent=row.rollout_percent,
+        expires_at=row.expires_at,
+        enabled=row.enabled,
+        version=row.version,
+        updated_by=row.updated_by,
+        updated_at=row.updated_at,
+        created_at=row.created_at,
+    )
+
+
+def policies_from_orm(rows: List[Any]) -> List[RCPPolicy]:
+    """Project a list of ORM policy rows (see :func:`policy_from_orm`)."""
+    return [policy_from_orm(row) for row in rows]
+
+
 class RCPPolicyList(BaseModel):
     """List of RCP policies with pagination."""
     policies: List[RCPPolicy] = Field(..., description="List of policies")
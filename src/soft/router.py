@@ -140,6 +140,16 @@ async def init_ia_on_startup():
     except Exception as e:
         logger.error(f"Failed to initialize IASupervisor: {e}", exc_info=True)
 
+# --- Shutdown: flush the autopilot runner's audit queue ---
+@app.on_event("shutdown")
+async def close_runner_on_shutdown():
+    """Write the autopilot runner's pending action audit entries."""
+    from .autopilot.runner import shutdown_runner
+    try:
+        await shutdown_runner()
+    except Exception as e:
+        logger.error("Failed to flush autopilot audit entries: %s", e, exc_info=True)
+
 # --- Startup logs ---
 @app.on_event("startup")
 async def print_routes():
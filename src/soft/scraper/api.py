@@ -55,6 +55,15 @@ class RunScraperRequest(BaseModel):
     params: Optional[Dict[str, Any]] = {}
     timeout: Optional[int] = 300  # 5 minutes default
 
+class RunScraperResponse(BaseModel):
+    """Response model for running dynamic scrapers."""
+    success: bool
+    message: str
+    logs: List[str] = []
+    offers: List[Dict[str, Any]] = []
+    count: int = 0
+    execution_time: float = 0.0
+
 class ScrapeResponse(BaseModel):
     """Response model for scraping offers."""
     success: bool
@@ -273,6 +273,45 @@ def set_payout_rate(seg_id: str, payout: float, ts: int, db: Session = None):
             db.close()
         db.close()
 
+def set_payout_rates(rates: Dict[str, float], ts: int, db: Session = None):
+    """Upsert payout rates for many segments in a single statement
+    
+    Args:
+        rates: Mapping of segment ID to payout amount
+        ts: Timestamp for the update
+        db: Optional SQLAlchemy session. If not provided, a new one will be created and closed.
+    """
+    if not rates:
+        return
+    should_close = False
+    if db is None:
+        db = SessionLocal()
+        should_close = True
+        
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        rows = [
+            {"segment_id": seg_id, "payout": payout, "updated_at": ts}
+            for seg_id, payout in rates.items()
+        ]
+        stmt = insert(PayoutRate).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PayoutRate.segment_id],
+            set_={"payout": stmt.excluded.payout, "updated_at": stmt.excluded.updated_at}
+        )
+        db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in set_payout_rates: {e}")
+        raise
+    finally:
+        if should_close and db:
+            db.close()
+
 def get_payout_rate(seg_id: str, db: Session = None) -> float:
     """Get the payout rate for a segment
     
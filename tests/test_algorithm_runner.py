@@ -0,0 +1,174 @@
+"""
+Tests for AlgorithmRunner action execution and audit writing.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.soft.autopilot import runner as runner_module
+from src.soft.autopilot.models import AuthorityLevel
+from src.soft.autopilot.runner import AlgorithmRunner
+from src.soft.rcp.schemas import ActionDTO
+
+
+class FakeSession:
+    """Async session stand-in recording the audit rows it is asked to insert."""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        if self.factory.failures:
+            self.factory.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.factory.pending.extend(rows)
+
+    async def commit(self):
+        self.factory.written.extend(self.factory.pending)
+        self.factory.pending.clear()
+
+
+class FakeSessionFactory:
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.pending = []
+        self.written = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _policy(risk_budget_daily):
+    return {
+        "authority": AuthorityLevel.SAFE_APPLY,
+        "risk_budget_daily": risk_budget_daily,
+        "dry_run": False,
+        "hard_guards": {},
+        "soft_guards": {},
+    }
+
+
+def _action(i, risk_score):
+    return ActionDTO(
+        id=f"action-{i}",
+        type="reweight",
+        algo_key="traffic_optimizer",
+        idempotency_key=f"key-{i}",
+        data={"target": f"destination_{i}", "current_value": 0.5, "new_value": 0.5},
+        risk_score=risk_score,
+    )
+
+
+class TestAuditWriter:
+
+    async def test_close_flushes_queued_entries(self):
+        factory = FakeSessionFactory()
+        runner = AlgorithmRunner(factory)
+
+        for i in range(5):
+            await runner._log_action_audit("traffic_optimizer", {"n": i}, "executed")
+        await runner.close()
+
+        assert [row["diff_json"]["action"]["n"] for row in factory.written] == list(range(5))
+        assert all(row["algo_key"] == "traffic_optimizer" for row in factory.written)
+
+    async def test_created_at_is_naive_utc(self):
+        factory = FakeSessionFactory()
+        runner = AlgorithmRunner(factory)
+
+        await runner._log_action_audit("traffic_optimizer", {"n": 1}, "executed")
+        await runner.close()
+
+        created_at = factory.written[0]["created_at"]
+        assert created_at.tzinfo is None
+        assert abs(created_at - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
+
+    async def test_failed_batch_is_retried(self, monkeypatch):
+        monkeypatch.setattr(runner_module, "AUDIT_RETRY_DELAY_S", 0)
+        factory = FakeSessionFactory(failures=runner_module.AUDIT_WRITE_ATTEMPTS - 1)
+        runner = AlgorithmRunner(factory)
+
+        await runner._log_action_audit("traffic_optimizer", {"n": 1}, "executed")
+        await runner.close()
+
+        assert len(factory.written) == 1
+
+    async def test_close_without_entries_is_a_no_op(self):
+        runner = AlgorithmRunner(FakeSessionFactory())
+
+        await runner.close()
+
+
+class TestRiskBudget:
+
+    async def test_concurrent_actions_never_exceed_daily_budget(self):
+        factory = FakeSessionFactory()
+        runner = AlgorithmRunner(factory)
+        policy = _policy(risk_budget_daily=1.0)
+
+        async def slow_reweight(action):
+            # Yield between the reservation and the outcome
+            await asyncio.sleep(0.01)
+            return True
+
+        runner._action_handlers["reweight"] = slow_reweight
+
+        results = await asyncio.gather(*(
+            runner.execute_action("traffic_optimizer", _action(i, 0.3), policy)
+            for i in range(10)
+        ))
+        await runner.close()
+
+        assert sum(results) == 3
+        assert sum(runner.risk_budgets.values()) == pytest.approx(0.9)
+        assert len(factory.written) == 3
+
+    async def test_failed_action_releases_its_reservation(self):
+        runner = AlgorithmRunner(FakeSessionFactory())
+        policy = _policy(risk_budget_daily=1.0)
+
+        async def failing_reweight(action):
+            await asyncio.sleep(0)
+            return False
+
+        runner._action_handlers["reweight"] = failing_reweight
+
+        results = await asyncio.gather(*(
+            runner.execute_action("traffic_optimizer", _action(i, 0.6), policy)
+            for i in range(3)
+        ))
+        await runner.close()
+
+        assert not any(results)
+        assert sum(runner.risk_budgets.values()) == pytest.approx(0.0)
+
+    async def test_budgets_are_tracked_per_algorithm(self):
+        runner = AlgorithmRunner(FakeSessionFactory())
+        policy = _policy(risk_budget_daily=0.5)
+
+        async def slow_reweight(action):
+            await asyncio.sleep(0.01)
+            return True
+
+        runner._action_handlers["reweight"] = slow_reweight
+
+        actions = [_action(i, 0.4) for i in range(4)]
+        for action in actions[2:]:
+            action.algo_key = "budget_arbitrage"
+        results = await asyncio.gather(*(
+            runner.execute_action(action.algo_key, action, policy) for action in actions
+        ))
+        await runner.close()
+
+        assert sum(results[:2]) == 1
+        assert sum(results[2:]) == 1
+        assert len(runner.risk_budgets) == 2
@@ -0,0 +1,94 @@
+"""
+Tests for the autopilot settings / AI policy cache and its invalidation.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import src.soft.dg  # noqa: F401  (resolves the dg <-> autopilot.api import cycle)
+from src.soft.autopilot import cache
+from src.soft.autopilot.api import router
+from src.soft.autopilot.models import Base
+from src.soft.dg.dependencies import get_async_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear_local()
+    yield
+    cache.clear_local()
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'autopilot.db'}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+    asyncio.run(engine.dispose())
+
+
+class TestCacheHelpers:
+
+    async def test_set_then_get_hits_local_cache(self):
+        await cache.set_json("test:key", {"a": 1})
+
+        assert await cache.get_json("test:key") == {"a": 1}
+
+    async def test_delete_invalidates(self):
+        await cache.set_json("test:key", {"a": 1})
+        await cache.delete("test:key")
+
+        assert await cache.get_json("test:key") is None
+
+    async def test_expired_local_entry_is_a_miss(self):
+        await cache.set_json("test:key", {"a": 1}, ttl=0)
+
+        assert await cache.get_json("test:key") is None
+
+
+class TestApiInvalidation:
+
+    def test_settings_update_invalidates_cached_settings(self, client):
+        url = "/autopilot/algorithms/traffic_optimizer/settings"
+        settings = client.get(url).json()["settings"]
+        client.put(url, json={**settings, "active": True}, headers={"X-Role": "admin"})
+        assert client.get(url).json()["version"] == 1  # now cached
+
+        response = client.put(url, json={**settings, "active": False}, headers={"X-Role": "admin"})
+        assert response.status_code == 200
+
+        body = client.get(url).json()
+        assert body["version"] == 2
+        assert body["settings"]["active"] is False
+
+    def test_policy_update_invalidates_cached_policy(self, client):
+        url = "/autopilot/ai/policy/traffic_optimizer"
+        headers = {"X-Role": "dg_ai"}
+        client.put(url, json={"risk_budget_daily": 5}, headers=headers)
+        assert client.get(url).json()["risk_budget_daily"] == 5  # now cached
+
+        response = client.put(url, json={"risk_budget_daily": 7, "dry_run": True}, headers=headers)
+        assert response.status_code == 200
+
+        body = client.get(url).json()
+        assert body["risk_budget_daily"] == 7
+        assert body["dry_run"] is True
@@ -0,0 +1,62 @@
+"""
+Tests for one iteration of the payout autopilot loop.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.soft.db import Base
+from src.soft.models import PayoutRate, Segment
+
+# src/soft/autopilot.py is shadowed by the src/soft/autopilot/ package: load it from its file
+_spec = importlib.util.spec_from_file_location(
+    "src.soft._autopilot_loop", Path(__file__).resolve().parents[1] / "src" / "soft" / "autopilot.py"
+)
+autopilot = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(autopilot)
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as db:
+        db.add_all([Segment(segment_id=seg_id) for seg_id in ("fr_mobile", "fr_desktop", "de_mobile")])
+        db.commit()
+    monkeypatch.setattr(autopilot, "SessionLocal", factory)
+    monkeypatch.setattr(autopilot, "fraud_rates", lambda session: {})
+    yield factory
+    engine.dispose()
+
+
+def _payouts(factory):
+    with factory() as db:
+        return {row.segment_id: row.payout for row in db.query(PayoutRate)}
+
+
+def test_loop_once_sets_a_payout_per_segment(session_factory, monkeypatch):
+    monkeypatch.setattr(autopilot, "epc_for_segment", lambda seg, horizon_hours, db: 1.0)
+
+    autopilot.loop_once()
+
+    assert set(_payouts(session_factory)) == {"fr_mobile", "fr_desktop", "de_mobile"}
+
+
+def test_failing_segment_is_skipped_without_losing_the_others(session_factory, monkeypatch):
+    def epc_for_segment(seg, horizon_hours, db):
+        if seg == "fr_desktop":
+            raise RuntimeError("EPC query failed")
+        return 1.0
+
+    monkeypatch.setattr(autopilot, "epc_for_segment", epc_for_segment)
+
+    autopilot.loop_once()
+
+    payouts = _payouts(session_factory)
+    assert set(payouts) == {"fr_mobile", "de_mobile"}
+    assert payouts["fr_mobile"] == float(autopilot.payout_formula_batch([1.0], [0.0])[0])
@@ -0,0 +1,69 @@
+"""
+Tests for the backtesting engine uplift statistics.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.soft.backtesting.engine import UpliftCalculator
+
+
+def _pandas_baseline(treatment_group, control_group, outcome_column):
+    """ATE statistics as computed with pandas mean() / std()."""
+    treatment_mean = treatment_group[outcome_column].mean()
+    control_mean = control_group[outcome_column].mean()
+    treatment_se = treatment_group[outcome_column].std() / np.sqrt(len(treatment_group))
+    control_se = control_group[outcome_column].std() / np.sqrt(len(control_group))
+    return {
+        "treatment_mean": treatment_mean,
+        "control_mean": control_mean,
+        "ate": treatment_mean - control_mean,
+        "ate_se": np.sqrt(treatment_se**2 + control_se**2),
+    }
+
+
+def _assert_close(actual, expected):
+    if pd.isna(expected):
+        assert math.isnan(actual)
+    else:
+        assert actual == pytest.approx(float(expected), rel=1e-9)
+
+
+@pytest.mark.parametrize("treatment, control", [
+    ([5.0, 7.0, 6.5, 8.0, 4.5], [4.0, 5.5, 5.0, 4.5]),
+    ([5.0, np.nan, 6.5, 8.0, np.nan], [4.0, 5.5, np.nan, 4.5]),
+    (pd.array([5, None, 7, 8], dtype="Int64"), pd.array([4, 5, None], dtype="Int64")),
+    ([5.0, 6.0], [4.0]),
+    ([5.0, 6.0, 7.0], []),
+    ([np.nan, np.nan], [1.0, 2.0]),
+])
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_causal_uplift_matches_pandas(treatment, control):
+    treatment_group = pd.DataFrame({"revenue": pd.Series(treatment, dtype=getattr(treatment, "dtype", "float64"))})
+    control_group = pd.DataFrame({"revenue": pd.Series(control, dtype=getattr(control, "dtype", "float64"))})
+
+    result = UpliftCalculator.calculate_causal_uplift(treatment_group, control_group, "revenue")
+    expected = _pandas_baseline(treatment_group, control_group, "revenue")
+
+    _assert_close(result["treatment_mean"], expected["treatment_mean"])
+    _assert_close(result["control_mean"], expected["control_mean"])
+    _assert_close(result["ate"], expected["ate"])
+    ci_lower, ci_upper = result["confidence_interval"]
+    _assert_close(ci_upper - ci_lower, 2 * 1.96 * expected["ate_se"])
+    assert result["treatment_size"] == len(treatment_group)
+    assert result["control_size"] == len(control_group)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_causal_uplift_empty_group_is_not_significant():
+    treatment_group = pd.DataFrame({"revenue": [5.0, 6.0, 7.0]})
+    control_group = pd.DataFrame({"revenue": pd.Series([], dtype="float64")})
+
+    result = UpliftCalculator.calculate_causal_uplift(treatment_group, control_group, "revenue")
+
+    assert math.isnan(result["ate"])
+    assert result["p_value"] == 1.0
+    assert result["statistically_significant"] is False
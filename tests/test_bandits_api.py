@@ -0,0 +1,16 @@
+"""
+Tests for the bandit optimizer registry of the bandits API.
+"""
+
+from src.soft.bandits.api import get_bandit_optimizer
+
+
+def test_call_form_does_not_split_optimizer_state():
+    optimizer = get_bandit_optimizer("registry_test")
+
+    assert get_bandit_optimizer("registry_test", "thompson") is optimizer
+    assert get_bandit_optimizer(algo_key="registry_test", algorithm="thompson") is optimizer
+
+
+def test_optimizers_are_separate_per_algorithm():
+    assert get_bandit_optimizer("registry_test", "ucb") is not get_bandit_optimizer("registry_test", "thompson")
@@ -0,0 +1,175 @@
+"""
+Tests for the budget and weight allocation optimizers.
+"""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from src.soft.autopilot.planner.optimizer import (
+    BudgetArbitrageOptimizer, WeightOptimizer, _solve_linear_knapsack
+)
+
+
+class TestDegenerateInputs:
+
+    def setup_method(self):
+        self.optimizer = BudgetArbitrageOptimizer()
+
+    def test_zero_budget_without_minimums_is_trivial(self):
+        candidates = [{"id": "a", "conversion_rate": 0.05}, {"id": "b", "conversion_rate": 0.02}]
+
+        result = self.optimizer._optimize_budget_sync(candidates, 0.0, {}, "maximize_conversions")
+
+        assert result.success
+        assert result.solver_status == "TRIVIAL"
+        assert result.constraints_satisfied
+        assert result.variables == {"budget_a": 0.0, "budget_b": 0.0}
+
+    def test_zero_budget_with_min_budget_is_infeasible(self):
+        candidates = [{"id": "a", "min_budget": 10.0}, {"id": "b"}]
+
+        result = self.optimizer._optimize_budget_sync(candidates, 0.0, {}, "maximize_conversions")
+
+        assert not result.success
+        assert result.solver_status == "INFEASIBLE"
+        assert not result.constraints_satisfied
+
+    def test_zero_budget_with_step_bound_is_infeasible(self):
+        # Cutting 100 to 0 is beyond the default 10% reallocation step
+        candidates = [{"id": "a", "current_budget": 100.0}]
+
+        result = self.optimizer._optimize_budget_sync(candidates, 0.0, {}, "maximize_conversions")
+
+        assert not result.success
+        assert result.solver_status == "INFEASIBLE"
+
+    def test_negative_budget_is_infeasible(self):
+        result = self.optimizer._optimize_budget_sync([{"id": "a"}], -5.0, {}, "maximize_conversions")
+
+        assert not result.success
+        assert not result.constraints_satisfied
+
+    def test_no_candidates_is_trivial(self):
+        result = self.optimizer._optimize_budget_sync([], 100.0, {}, "maximize_conversions")
+
+        assert result.success
+        assert result.variables == {}
+
+
+def _lp_optimum(coefficients, lo, hi, total):
+    """Reference LP: max c.x s.t. sum(x) == total, lo <= x <= hi (None if infeasible)."""
+    result = linprog(
+        -np.asarray(coefficients), A_eq=np.ones((1, len(coefficients))), b_eq=[total],
+        bounds=list(zip(lo, hi)), method="highs"
+    )
+    if result.status != 0:
+        return None
+    return -result.fun
+
+
+class TestClosedFormAgainstLP:
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_instances_match_lp(self, seed):
+        rng = np.random.default_rng(seed)
+        n = int(rng.integers(2, 12))
+        coefficients = rng.uniform(0, 1, n)
+        lo = rng.uniform(0, 10, n)
+        hi = lo + rng.uniform(0, 20, n)
+        total = rng.uniform(lo.sum(), hi.sum())
+
+        allocation = _solve_linear_knapsack(coefficients, lo, hi, total)
+
+        assert allocation is not None
+        assert allocation.sum() == pytest.approx(total)
+        assert (allocation >= lo - 1e-9).all() and (allocation <= hi + 1e-9).all()
+        assert coefficients @ allocation == pytest.approx(_lp_optimum(coefficients, lo, hi, total))
+
+    def test_binding_bounds_match_lp(self):
+        # The best item is capped by its max, the worst is held at its min
+        coefficients = np.array([3.0, 2.0, 1.0])
+        lo = np.array([0.0, 0.0, 5.0])
+        hi = np.array([10.0, 50.0, 50.0])
+
+        allocation = _solve_linear_knapsack(coefficients, lo, hi, 40.0)
+
+        np.testing.assert_allclose(allocation, [10.0, 25.0, 5.0])
+        assert coefficients @ allocation == pytest.approx(_lp_optimum(coefficients, lo, hi, 40.0))
+
+    def test_ties_match_lp_objective(self):
+        coefficients = np.array([1.0, 2.0, 2.0, 1.0])
+        lo = np.zeros(4)
+        hi = np.full(4, 10.0)
+
+        allocation = _solve_linear_knapsack(coefficients, lo, hi, 25.0)
+
+        assert allocation.sum() == pytest.approx(25.0)
+        assert coefficients @ allocation == pytest.approx(_lp_optimum(coefficients, lo, hi, 25.0))
+
+    @pytest.mark.parametrize("total", [4.0, 31.0])
+    def test_infeasible_totals_match_lp(self, total):
+        coefficients = np.array([1.0, 2.0, 3.0])
+        lo = np.array([1.0, 2.0, 2.0])
+        hi = np.array([10.0, 10.0, 10.0])
+
+        assert _solve_linear_knapsack(coefficients, lo, hi, total) is None
+        assert _lp_optimum(coefficients, lo, hi, total) is None
+
+    def test_budget_step_bounds_match_lp(self):
+        candidates = [
+            {"id": "a", "current_budget": 100.0, "conversion_rate": 0.05, "cost_per_click": 1.0},
+            {"id": "b", "current_budget": 200.0, "conversion_rate": 0.02, "cost_per_click": 0.5},
+            {"id": "c", "current_budget": 100.0, "conversion_rate": 0.01, "cost_per_click": 1.0,
+             "max_budget": 95.0},
+        ]
+
+        result = BudgetArbitrageOptimizer()._optimize_budget_sync(
+            candidates, 400.0, {"max_reallocation_step": 0.1}, "maximize_conversions"
+        )
+
+        coefficients = np.array([0.05, 0.04, 0.01])
+        lo = np.array([90.0, 180.0, 90.0])
+        hi = np.array([110.0, 220.0, 95.0])
+        assert result.solver_status == "OPTIMAL"
+        assert result.objective_value == pytest.approx(_lp_optimum(coefficients, lo, hi, 400.0))
+        assert result.variables == pytest.approx({"budget_a": 110.0, "budget_b": 200.0, "budget_c": 90.0})
+
+    def test_infeasible_step_bounds_fall_back(self):
+        # Each budget may move by 10%, so 400 cannot be reached from 200 in total
+        candidates = [{"id": "a", "current_budget": 100.0}, {"id": "b", "current_budget": 100.0}]
+
+        result = BudgetArbitrageOptimizer()._optimize_budget_sync(
+            candidates, 400.0, {}, "maximize_conversions"
+        )
+
+        assert result.fallback_used
+
+    def test_weights_match_lp(self):
+        destinations = [
+            {"id": "a", "current_weight": 0.5, "conversion_rate": 0.02},
+            {"id": "b", "current_weight": 0.3, "conversion_rate": 0.05},
+            {"id": "c", "current_weight": 0.2, "conversion_rate": 0.03},
+        ]
+
+        result = WeightOptimizer()._optimize_weights_sync(destinations, {}, "maximize_conversions")
+
+        coefficients = np.array([20.0, 50.0, 30.0])
+        lo = np.array([0.35, 0.15, 0.05])
+        hi = np.array([0.65, 0.45, 0.35])
+        assert result.solver_status == "OPTIMAL"
+        assert sum(result.variables.values()) == pytest.approx(1.0)
+        assert result.objective_value == pytest.approx(_lp_optimum(coefficients, lo, hi, 1.0))
+
+    def test_zero_coefficient_objective_is_feasible(self):
+        candidates = [
+            {"id": "a", "current_budget": 100.0, "min_budget": 95.0},
+            {"id": "b", "current_budget": 100.0},
+        ]
+
+        result = BudgetArbitrageOptimizer()._optimize_budget_sync(candidates, 200.0, {}, "balance")
+
+        assert result.solver_status == "OPTIMAL"
+        assert result.objective_value == 0.0
+        assert sum(result.variables.values()) == pytest.approx(200.0)
+        assert result.variables["budget_a"] >= 95.0
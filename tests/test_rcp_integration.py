@@ -113,7 +113,7 @@ class TestRCPIntegration:
                                 assert result["rcp_applied"] is True
                                 
                                 # Check that execute_action was called with modified data
-                                executed_data = mock_execute.call_args[0][1]
+                                executed_data = mock_execute.call_args[0][1].data
                                 assert executed_data["weight"] == 0.7
 
     @pytest.mark.asyncio
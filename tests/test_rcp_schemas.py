@@ -0,0 +1,87 @@
+"""
+Tests for projecting ORM policy rows onto RCP policy schemas.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from src.soft.rcp.models import RCPAuthority, RCPMode, RCPScope
+from src.soft.rcp.schemas import (
+    GateCondition, GuardLimits, MutationRule, RCPPolicy, RCPPolicyCreate, Selector,
+    policies_from_orm, policy_from_orm
+)
+
+
+def _orm_row(policy: RCPPolicyCreate, **metadata):
+    """Policy row shaped like RCPRepository.create_policy stores it."""
+    return SimpleNamespace(
+        id=policy.id,
+        name=policy.name,
+        scope=RCPScope(policy.scope),
+        algo_key=policy.algo_key,
+        selector_json=policy.selector.dict() if policy.selector else None,
+        mode=RCPMode(policy.mode),
+        authority_required=RCPAuthority(policy.authority_required),
+        hard_guards_json=policy.hard_guards.dict(),
+        soft_guards_json=policy.soft_guards.dict(),
+        limits_json=policy.limits.dict(),
+        gates_json=[gate.dict() for gate in policy.gates],
+        mutations_json=[mutation.dict() for mutation in policy.mutations],
+        schedule_cron=policy.schedule_cron,
+        rollout_percent=policy.rollout_percent,
+        expires_at=policy.expires_at,
+        enabled=policy.enabled,
+        **metadata
+    )
+
+
+METADATA = {
+    "version": 3,
+    "updated_by": "admin",
+    "updated_at": datetime(2025, 8, 20, 12, 0),
+    "created_at": datetime(2025, 8, 1, 9, 30),
+}
+
+
+def test_policy_from_orm_matches_validated_policy():
+    created = RCPPolicyCreate(
+        id="policy-001",
+        name="Cap reweights",
+        scope="algorithm",
+        algo_key="traffic_optimizer",
+        selector=Selector(geo=["FR"], device=["mobile"]),
+        mode="monitor",
+        authority_required="admin",
+        hard_guards=GuardLimits(weight_delta_max=0.1),
+        gates=[GateCondition(left="metrics.cvr_1h", op=">=", right=0.02)],
+        mutations=[MutationRule(action_type="reweight", clamp_fields={"weight": {"min": 0.0, "max": 0.5}})],
+        rollout_percent=0.5,
+        expires_at=datetime(2025, 12, 31),
+    )
+    expected = RCPPolicy.model_validate({**created.model_dump(), **METADATA})
+
+    policy = policy_from_orm(_orm_row(created, **METADATA))
+
+    assert isinstance(policy, RCPPolicy)
+    assert policy.model_dump() == expected.model_dump()
+    assert policy.scope == "algorithm"
+    assert isinstance(policy.gates[0], GateCondition)
+
+
+def test_policy_from_orm_defaults_missing_json_columns():
+    created = RCPPolicyCreate(id="policy-002", name="Global defaults")
+    row = _orm_row(created, **METADATA)
+    row.hard_guards_json = row.soft_guards_json = row.limits_json = None
+    row.gates_json = row.mutations_json = None
+    expected = RCPPolicy.model_validate({**created.model_dump(), **METADATA})
+
+    policy = policy_from_orm(row)
+
+    assert policy.selector is None
+    assert policy.model_dump() == expected.model_dump()
+
+
+def test_policies_from_orm_keeps_order():
+    rows = [_orm_row(RCPPolicyCreate(id=f"policy-{i}", name=f"Policy {i}"), **METADATA) for i in range(3)]
+
+    assert [policy.id for policy in policies_from_orm(rows)] == ["policy-0", "policy-1", "policy-2"]
@@ -0,0 +1,50 @@
+"""
+Tests for the payout rate storage helpers.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.soft.db import Base
+from src.soft.models import PayoutRate, Segment
+from src.soft.storage import get_payout_rate, set_payout_rates
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    db.add_all([Segment(segment_id=seg_id) for seg_id in ("fr_mobile", "fr_desktop", "de_mobile")])
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_set_payout_rates_inserts_new_segments(session):
+    set_payout_rates({"fr_mobile": 0.12, "fr_desktop": 0.2}, 1000, db=session)
+
+    assert get_payout_rate("fr_mobile", db=session) == 0.12
+    assert get_payout_rate("fr_desktop", db=session) == 0.2
+
+
+def test_set_payout_rates_updates_existing_and_leaves_others(session):
+    set_payout_rates({"fr_mobile": 0.12, "fr_desktop": 0.2}, 1000, db=session)
+
+    set_payout_rates({"fr_mobile": 0.3, "de_mobile": 0.15}, 2000, db=session)
+    session.expire_all()
+
+    rows = {row.segment_id: (row.payout, row.updated_at) for row in session.query(PayoutRate)}
+    assert rows == {
+        "fr_mobile": (0.3, 2000),
+        "fr_desktop": (0.2, 1000),
+        "de_mobile": (0.15, 2000),
+    }
+
+
+def test_set_payout_rates_with_no_rates_is_a_no_op(session):
+    set_payout_rates({}, 1000, db=session)
+
+    assert session.query(PayoutRate).count() == 0